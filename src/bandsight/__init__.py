@@ -0,0 +1,9 @@
+"""
+bandsight
+Command-line entry point for the Bandsight pipeline.
+
+  python src/bandsight <command> [options]      (or PYTHONPATH=src python -m bandsight)
+
+Each subcommand imports only the modules it needs, so quick paths such as
+`registry` or `scrape --dry-run` never load requests/bs4/dateutil/tenacity.
+"""
@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+if not __package__:
+    # `python src/bandsight …`: make src/ importable like `python -m bandsight` with PYTHONPATH=src
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bandsight.cli import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+bandsight.bench
+Import-time budgets and feed-builder benchmarks.
+
+  bandsight bench imports            # fails (exit 1) when a budget is exceeded
+                                     # (budgets are multiples of a stdlib baseline)
+  bandsight bench build --items 300 3000 30000
+"""
+
+import argparse
+import datetime as dt
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SRC = Path(__file__).resolve().parent.parent
+
+# Budgets are multiples of the cold import time of stdlib modules every entry
+# point needs anyway, so a slower or busier machine moves both sides alike.
+# Each side is the best of several interleaved runs in fresh interpreters.
+BASELINE_MODULES = ("argparse", "dataclasses", "datetime", "json", "logging", "pathlib",
+                    "threading", "typing", "urllib.parse")
+IMPORT_BUDGETS: Dict[str, float] = {
+    "bandsight.cli": 0.5,
+    "feeds_site_builder": 4.0,
+    "scraper": 4.5,
+}
+IMPORT_RUNS = 7
+# must not be imported just by importing an entry module
+HEAVY_MODULES = ("requests", "bs4", "dateutil", "tenacity", "yaml", "lxml", "numpy")
+
+# -------- Import budgets --------
+
+def import_time(modules: Tuple[str, ...]) -> Tuple[float, List[str]]:
+    """Cumulative import time (ms) of modules in one fresh interpreter, and any heavy modules pulled in."""
+    code = f"import sys, {', '.join(modules)}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=str(SRC) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                       capture_output=True, text=True, env=env, check=True)
+    total = 0.0
+    for line in p.stderr.splitlines():
+        cols = line.split("|")
+        # top-level rows only (one leading space); nested rows are already in their parent's total
+        if len(cols) == 3 and cols[2].rstrip()[1:] in modules and cols[2][1] != " ":
+            total += int(cols[1]) / 1000
+    return total, [m for m in p.stdout.strip().split(",") if m]
+
+def check_imports(runs: int = IMPORT_RUNS) -> bool:
+    best = dict.fromkeys(("baseline", *IMPORT_BUDGETS), float("inf"))
+    leaked: Dict[str, List[str]] = {}
+    for _ in range(runs):
+        best["baseline"] = min(best["baseline"], import_time(BASELINE_MODULES)[0])
+        for module in IMPORT_BUDGETS:
+            ms, leaked[module] = import_time((module,))
+            best[module] = min(best[module], ms)
+    baseline = best["baseline"]
+    print(f"{'stdlib baseline':<22} {baseline:7.1f} ms  best of {runs}")
+    ok = True
+    for module, budget in IMPORT_BUDGETS.items():
+        ratio = best[module] / baseline
+        status = "ok"
+        if ratio > budget:
+            status, ok = f"OVER BUDGET ({budget:.1f}x)", False
+        if leaked[module]:
+            status, ok = f"imports {', '.join(leaked[module])}", False
+        print(f"{module:<22} {best[module]:7.1f} ms  {ratio:4.2f}x  {status}")
+    return ok
+
+# -------- Builder benchmark --------
+
+def synthetic_records(n: int) -> List[Dict]:
+    base = dt.date.today()
+    desc = "<p>Lead a team delivering <b>council</b> services &amp; projects.</p>" * 40
+    out = []
+    for i in range(n):
+        posted = base - dt.timedelta(days=i % 40)
+        out.append({
+            "council": f"Council {i % 79}",
+            "title": f"Officer {i} – Band {1 + i % 8}",
+            "link": f"https://jobs.example/{i % 79}/job/{i}",
+            "posted_date": posted.isoformat(),
+            "closing_date": (posted + dt.timedelta(days=14)).isoformat(),
+            "salary": f"${60000 + (i % 50) * 1000:,} per annum",
+            "band": f"Band {1 + i % 8}",
+            "description_html": desc,
+            "scrape_date": f"{base.isoformat()}T06:00:00+11:00",
+            "source_engine": "pageup",
+        })
+    return out
+
+def bench_build(sizes: List[int], repeat: int = 3) -> None:
+    """
+    Cold: every item rendered; validated: cold plus --validate; warm: every
+    item served from the render cache.
+    """
+    import io
+    import feeds_site_builder as fsb
+    from feed_cache import RenderCache
+    for n in sizes:
+        rows = synthetic_records(n)
+        cache = RenderCache()
+        fsb.build(rows, "bench", "https://example/feed.xml", "bench", n, io.StringIO(), cache=cache)
+        best = {"cold": float("inf"), "validated": float("inf"), "warm": float("inf")}
+        for _ in range(repeat):
+            for name, validate, c in (("cold", False, None), ("validated", True, None), ("warm", False, cache)):
+                fsb.VALIDATE = validate
+                out = io.StringIO()
+                t0 = time.perf_counter()
+                fsb.build(rows, "bench", "https://example/feed.xml", "bench", n, out, cache=c)
+                best[name] = min(best[name], time.perf_counter() - t0)
+        fsb.VALIDATE = False
+        print(f"build {n:>7} items  " + "  ".join(f"{k} {v * 1000:9.1f} ms" for k, v in best.items())
+              + f"  {len(out.getvalue().encode('utf-8')):>12,} B")
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(prog="bandsight bench", description="Import budgets and builder benchmarks")
+    sub = ap.add_subparsers(dest="what", required=True)
+    i = sub.add_parser("imports", help="Check import-time budgets of the entry modules")
+    i.add_argument("--runs", type=int, default=IMPORT_RUNS, help="Interpreters per module; the best run counts")
+    b = sub.add_parser("build", help="Time feeds_site_builder.build on synthetic records")
+    b.add_argument("--items", type=int, nargs="+", default=[300, 3000, 30000])
+    b.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    if args.what == "imports":
+        if not check_imports(args.runs):
+            raise SystemExit(1)
+    else:
+        sys.path.insert(0, str(SRC))
+        bench_build(args.items, args.repeat)
@@ -0,0 +1,47 @@
+"""
+bandsight.cli
+Subcommand dispatch. Command modules are imported only when their command runs.
+"""
+
+import argparse
+import importlib
+import sys
+from typing import List, Optional
+
+# command -> (module, function, help); function takes the remaining argv
+COMMANDS = {
+    "scrape": ("scraper", "main", "Scrape council job boards into JSON Lines"),
+    "build": ("feeds_site_builder", "main", "Build RSS/JSON feeds from the job history"),
+    "merge": ("sharding", "main", "Merge sharded scrape outputs into the job history"),
+    "compact": ("history_compact", "main", "Drop unchanged re-scrapes from the job history"),
+    "registry": ("bandsight.cli", "list_registry", "List active council start URLs and their vendors"),
+    "bench": ("bandsight.bench", "main", "Check import-time budgets and benchmark the feed builder"),
+}
+
+def usage() -> str:
+    width = max(len(c) for c in COMMANDS)
+    lines = ["usage: bandsight <command> [options]", "", "commands:"]
+    lines += [f"  {c.ljust(width)}  {h}" for c, (_, _, h) in COMMANDS.items()]
+    lines += ["", "Run `bandsight <command> --help` for command options."]
+    return "\n".join(lines)
+
+def list_registry(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(prog="bandsight registry", description=COMMANDS["registry"][2])
+    ap.add_argument("--councils", default="data/councils.yaml", help="Path to YAML/JSON registry")
+    args = ap.parse_args(argv)
+    import registry
+    for src in registry.load_sources(args.councils):
+        print(f"{src.council}\t{src.vendor or 'auto'}\t{src.url}")
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(usage())
+        return
+    cmd, rest = argv[0], argv[1:]
+    if cmd not in COMMANDS:
+        print(f"bandsight: unknown command {cmd!r}\n\n{usage()}", file=sys.stderr)
+        raise SystemExit(2)
+    module, func, _ = COMMANDS[cmd]
+    sys.argv = [f"bandsight {cmd}"] + rest
+    getattr(importlib.import_module(module), func)(rest)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+canonical.py
+URL canonicalisation and a job-ID index so each job's detail page is fetched
+at most once per run, and not at all while history still has a fresh copy.
+
+canonical_url() lower-cases scheme and host, drops fragments, default ports,
+tracking parameters and trailing slashes, and sorts the query. job_key()
+then applies per-ATS rules that reduce a detail URL to the platform's own job
+ID, so slug and ?source=public variants collapse:
+
+  https://x.pulsesoftware.com/Pulse/job/123/any-slug?source=public -> pulse:x.pulsesoftware.com:123
+  https://careers.example/Vacancies/456/title/foo/                 -> vacancy:careers.example:456
+  https://x.applynow.net.au/jobs/engineering/civil-engineer        -> applynow:x.applynow.net.au:engineering/civil-engineer
+
+ApplyNow's /jobs/ URLs carry no ID (the first segment is often a
+category), so they key on the whole path after /jobs/.
+
+Emitted record links are left as fetched: item GUIDs hash the link.
+"""
+
+import datetime as dt
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "source", "src", "ref", "referrer", "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "trk", "sessionid", "jsessionid",
+}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def canonical_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+# -------- Per-ATS job IDs --------
+
+# (host test, path pattern, key prefix); the first match wins, group 1 is the job ID
+JOB_ID_RULES: List[Tuple[Callable[[str], bool], Pattern[str], str]] = [
+    (lambda h: True, re.compile(r"/Pulse/job/(\d+)", re.I), "pulse"),
+    (lambda h: h.endswith("pageuppeople.com"), re.compile(r"/job/(\d+)", re.I), "pageup"),
+    (lambda h: h.endswith("applynow.net.au"), re.compile(r"/applyjob/(\d+)", re.I), "applynow"),
+    (lambda h: h.endswith("applynow.net.au"), re.compile(r"/jobs/(.+)", re.I), "applynow"),
+    # Scout/BigRedSky/Mercury and RecruitmentHub: /Vacancies/<id>[/title/<slug>]
+    (lambda h: True, re.compile(r"/Vacancies/(\d+)", re.I), "vacancy"),
+]
+
+def job_key(url: str) -> str:
+    canon = canonical_url(url)
+    parts = urlsplit(canon)
+    host = parts.hostname or ""
+    for host_ok, pattern, prefix in JOB_ID_RULES:
+        if host_ok(host):
+            m = pattern.search(parts.path)
+            if m:
+                return f"{prefix}:{host}:{m.group(1).lower()}"
+    return canon
+
+def unique(urls: Iterable[str]) -> List[str]:
+    """Order-preserving dedupe by job_key (first URL of each job wins)."""
+    seen = set()
+    out = []
+    for u in urls:
+        k = job_key(u)
+        if k not in seen:
+            seen.add(k)
+            out.append(u)
+    return out
+
+# -------- Index --------
+
+def fetched_at(rec: Dict) -> Optional[dt.datetime]:
+    """When the record's detail page was actually fetched (aware), if known."""
+    try:
+        seen = dt.datetime.fromisoformat((rec.get("fetched_at") or rec.get("scrape_date") or "").replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return seen if seen.tzinfo is not None else None
+
+class JobIndex:
+    """
+    Job keys claimed during this run, plus the latest history record of jobs
+    scraped within the reuse window (known) and of every job in history
+    (visited, for sitemap lastmod checks). Claiming happens before fetches,
+    from one thread, so no locking is needed.
+    """
+    def __init__(self, known: Optional[Dict[str, Dict]] = None, visited: Optional[Dict[str, Dict]] = None):
+        self.claimed: set = set()
+        self.known: Dict[str, Dict] = known or {}
+        self.visited: Dict[str, Dict] = visited or {}
+        self.reused = 0
+        self.unmodified = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_history(cls, records: Iterable[Dict], reuse_days: float,
+                     now: Optional[dt.datetime] = None) -> "JobIndex":
+        """
+        Index history records by job. Those whose detail page was fetched
+        within reuse_days (0 = none) are reused outright; any of them can be
+        reused when a sitemap says the page has not changed since.
+        """
+        known: Dict[str, Dict] = {}
+        visited: Dict[str, Dict] = {}
+        cutoff = (now or dt.datetime.now(dt.UTC)) - dt.timedelta(days=reuse_days)
+        for r in records:
+            if r.get("stale") or not r.get("link"):
+                continue
+            # reused records carry the original fetch time, so reuse cannot extend itself
+            seen = fetched_at(r)
+            if seen is None:
+                continue
+            k = job_key(r["link"])
+            if k not in visited or r["scrape_date"] >= visited[k]["scrape_date"]:
+                visited[k] = r
+            if reuse_days > 0 and seen >= cutoff and (k not in known or r["scrape_date"] >= known[k]["scrape_date"]):
+                known[k] = r
+        return cls(known, visited)
+
+    def claim(self, urls: Iterable[str], council: str = "") -> List[str]:
+        """URLs whose job the council has not claimed yet this run, deduplicated; claims them."""
+        out = []
+        for u in urls:
+            k = (council, job_key(u))
+            if k in self.claimed:
+                self.skipped += 1
+                continue
+            self.claimed.add(k)
+            out.append(u)
+        return out
+
+    def unchanged(self, url: str, council: str, lastmod: Optional[dt.datetime]) -> Optional[Dict]:
+        """This council's history record for the job at url, if fetched after lastmod."""
+        if lastmod is None:
+            return None
+        rec = self.visited.get(job_key(url))
+        if rec is None or rec.get("council") != council:
+            return None
+        seen = fetched_at(rec)
+        if seen is None or seen < lastmod:
+            return None
+        self.unmodified += 1
+        return rec
+
+    def recent(self, url: str, council: str) -> Optional[Dict]:
+        """This council's fresh history record for the job at url, if any."""
+        rec = self.known.get(job_key(url))
+        if rec is not None and rec.get("council") == council:
+            self.reused += 1
+            return rec
+        return None
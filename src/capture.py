@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+capture.py
+Record every response a scrape fetches into a WARC file and replay it later
+without the network, e.g. to re-run fixed parsers over past runs or as a
+deterministic benchmark input.
+
+Archives are WARC/1.0 with one gzip member per record (.warc.gz), so warcio
+and similar tools can read them. Each run starts with a warcinfo record
+holding the run's start time. After that comes one response record per
+fetch. A response record carries the requested URL as WARC-Target-URI, the
+council in WARC-Bandsight-Council, and the decoded body as an HTTP/1.1
+message. POSTs to JSON search APIs hit one URL with many bodies, so their
+target URI gets a "#post-<sha1 of the body>" fragment (see request_key).
+"""
+
+import datetime as dt
+import gzip
+import hashlib
+import io
+import json
+import threading
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+# body is stored decoded, so framing headers from the wire no longer apply
+DROP_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+class ReplayMiss(Exception):
+    pass
+
+def request_key(url: str, method: str = "GET", body: Optional[object] = None) -> str:
+    """Archive key of a request: the URL, plus a body hash for anything but GET."""
+    if method.upper() == "GET":
+        return url
+    raw = json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return f"{url}#{method.lower()}-{hashlib.sha1(raw).hexdigest()[:16]}"
+
+def _warc_record(headers: List[Tuple[str, str]], block: bytes) -> bytes:
+    head = "WARC/1.0\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers)
+    head += f"Content-Length: {len(block)}\r\n\r\n"
+    return gzip.compress(head.encode("utf-8") + block + b"\r\n\r\n", mtime=0)
+
+def _stamp(d: dt.datetime) -> str:
+    return d.astimezone(dt.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+# -------- Capture --------
+
+class CaptureWriter:
+    """Appends response records to <dir>/<run start>.warc.gz; safe to share between threads."""
+    def __init__(self, out_dir: Path, started: Optional[dt.datetime] = None):
+        started = started or dt.datetime.now(dt.UTC)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.path = out_dir / f"{started.strftime('%Y%m%dT%H%M%SZ')}.warc.gz"
+        self._lock = threading.Lock()
+        self._f = self.path.open("ab")
+        self.records = 0
+        info = f"software: bandsight-scraper\r\nrun-started: {_stamp(started)}\r\n".encode("utf-8")
+        self._write([("WARC-Type", "warcinfo"), ("WARC-Record-ID", f"<urn:uuid:{uuid.uuid4()}>"),
+                     ("WARC-Date", _stamp(started)), ("Content-Type", "application/warc-fields")], info)
+
+    def _write(self, headers: List[Tuple[str, str]], block: bytes) -> None:
+        rec = _warc_record(headers, block)
+        with self._lock:
+            self._f.write(rec)
+
+    def record(self, url: str, council: str, resp: "requests.Response") -> None:
+        status = f"HTTP/1.1 {resp.status_code} {resp.reason or ''}".rstrip()
+        hdrs = "".join(f"{k}: {v}\r\n" for k, v in resp.headers.items() if k.lower() not in DROP_HEADERS)
+        block = f"{status}\r\n{hdrs}\r\n".encode("latin-1", "replace") + resp.content
+        self._write([
+            ("WARC-Type", "response"),
+            ("WARC-Record-ID", f"<urn:uuid:{uuid.uuid4()}>"),
+            ("WARC-Date", _stamp(dt.datetime.now(dt.UTC))),
+            ("WARC-Target-URI", url),
+            ("WARC-Bandsight-Council", council),
+            ("Content-Type", "application/http; msgtype=response"),
+        ], block)
+        self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._f.close()
+
+# -------- Replay --------
+
+def read_records(path: Path) -> Iterator[Tuple[Dict[str, str], bytes]]:
+    """(WARC headers, block) for every record in a .warc.gz (or plain .warc) file."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        while True:
+            line = f.readline()
+            if not line:
+                return
+            if not line.strip():
+                continue
+            headers: Dict[str, str] = {}
+            for raw in iter(f.readline, b"\r\n"):
+                if not raw:
+                    return
+                k, _, v = raw.decode("utf-8").partition(":")
+                headers[k.strip().lower()] = v.strip()
+            block = f.read(int(headers.get("content-length", "0")))
+            yield headers, block
+
+class Replay:
+    """In-memory index of one captured run: requested URL -> (status, headers, body)."""
+    def __init__(self, path: Path):
+        self.path = path
+        self.started: Optional[str] = None
+        self.responses: Dict[str, Tuple[int, Dict[str, str], bytes]] = {}
+        self.councils: set = set()
+        for headers, block in read_records(path):
+            kind = headers.get("warc-type")
+            if kind == "warcinfo" and self.started is None:
+                for line in block.decode("utf-8").splitlines():
+                    if line.startswith("run-started:"):
+                        self.started = line.split(":", 1)[1].strip()
+            elif kind == "response":
+                self.responses[headers["warc-target-uri"]] = self._parse_http(block)
+                self.councils.add(headers.get("warc-bandsight-council", ""))
+
+    @staticmethod
+    def _parse_http(block: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        head, _, body = block.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        hdrs = {}
+        for line in lines[1:]:
+            k, _, v = line.partition(":")
+            hdrs[k.strip()] = v.strip()
+        return status, hdrs, body
+
+    def get(self, url: str) -> "requests.Response":
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        try:
+            status, hdrs, body = self.responses[url]
+        except KeyError:
+            raise ReplayMiss(f"not in {self.path.name}: {url}") from None
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers = CaseInsensitiveDict(hdrs)
+        resp.url = url
+        resp.raw = io.BytesIO(body)
+        resp._content = body
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        return resp
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+discovery.py
+Sitemap and feed discovery of job pages for GenericHTMLAdapter.
+
+Many council CMSs publish a sitemap.xml with a <lastmod> per page, and some
+ATS hosts publish a job RSS feed. For a generic source, discover() looks for
+one of these in this order:
+  1. the source's `tuning: {discovery: <url>}`,
+  2. the Sitemap: lines in the host's robots.txt,
+  3. /sitemap.xml on the host.
+Sitemap indexes are followed one level down, to child sitemaps that look
+job-related first. The result is a list of job-like URLs in the start URL's
+section (same host, same first path segment; see in_section), each with its
+lastmod (a sitemap's <lastmod>, or an RSS/Atom item's pubDate/updated). A
+council's sitemap covers its whole site, so without the section check a
+news story such as /News/jobs-fair-returns would pass for a job page.
+
+The landing page's listing still decides which jobs are open: a job that
+is no longer listed is gone, however recent its lastmod. Entries only tell
+the adapter which listed jobs are unchanged since we last fetched them, so
+their history record is reused (see JobIndex.unchanged). Only when the
+listing shows no job links at all (e.g. it is rendered client-side) do the
+entries stand in for it. When no sitemap is found, any RSS
+<link rel="alternate"> the landing page advertises is tried instead. A
+failed probe (4xx/5xx, connection error) counts as no sitemap.
+`discovery: off` skips the probes entirely.
+"""
+
+import datetime as dt
+import gzip
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+# xml.etree, email.utils and capture are imported on first use
+if TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
+    import requests
+
+MAX_CHILD_SITEMAPS = 5     # children of a sitemap index fetched when none look job-related
+MAX_AGE_DAYS = 180         # sitemap entries not modified for this long are treated as expired postings
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+
+JOB_HINT_RE = re.compile(r"/(job|vacanc|opportunit|positions?|careers?/[^#]*\d)", re.I)
+SYSTEM_PAGE_RE = re.compile(r"/(mysubmissions|profile|sitemap|info/help|help|site-?map)\b", re.I)
+LISTING_PAGE_RE = re.compile(r"/(careers|employment|vacancies|jobs)(/|$)", re.I)
+
+def looks_like_job(url: str) -> bool:
+    """Likely a job detail page: job-ish path, not a system page, not a digit-free listing page."""
+    if not JOB_HINT_RE.search(url) or SYSTEM_PAGE_RE.search(url):
+        return False
+    return not (LISTING_PAGE_RE.search(url) and not re.search(r"\d", url))
+
+def section(url: str) -> Tuple[str, str]:
+    """(host, path prefix) of the site section a URL sits in: its first path segment, or the host root."""
+    parts = urlsplit(url)
+    first = parts.path.strip("/").split("/", 1)[0].lower()
+    return (parts.hostname or "").lower(), f"/{first}/" if first else "/"
+
+def in_section(url: str, start_url: str) -> bool:
+    """url is on start_url's host and under its first path segment (/careers/..., /vacancies/...)."""
+    host, prefix = section(start_url)
+    parts = urlsplit(url)
+    return ((parts.hostname or "").lower() == host
+            and (parts.path.lower().rstrip("/") + "/").startswith(prefix))
+
+@dataclass
+class Entry:
+    url: str
+    lastmod: Optional[dt.datetime] = None
+
+# -------- Parsing --------
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+def _child_text(node: "ET.Element", name: str) -> Optional[str]:
+    for c in node:
+        if _local(c.tag) == name:
+            return (c.text or "").strip() or None
+    return None
+
+def parse_lastmod(s: Optional[str]) -> Optional[dt.datetime]:
+    """W3C datetime (sitemaps, Atom) or RFC 822 (RSS) as aware UTC."""
+    if not s:
+        return None
+    s = s.strip()
+    try:
+        if re.fullmatch(r"\d{4}-\d{2}-\d{2}", s):
+            # date-only: the page may have changed at any time that day
+            d = dt.datetime.fromisoformat(s) + dt.timedelta(days=1)
+        else:
+            d = dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except ValueError:
+        from email.utils import parsedate_to_datetime
+        try:
+            d = parsedate_to_datetime(s)
+        except (TypeError, ValueError):
+            return None
+    return d.replace(tzinfo=dt.UTC) if d.tzinfo is None else d.astimezone(dt.UTC)
+
+def _xml_root(body: bytes) -> Optional["ET.Element"]:
+    import xml.etree.ElementTree as ET
+    if body[:2] == b"\x1f\x8b":
+        try:
+            body = gzip.decompress(body)
+        except (OSError, EOFError):
+            return None
+    try:
+        return ET.fromstring(body)
+    except ET.ParseError:
+        return None
+
+def parse_document(body: bytes, base_url: str) -> Tuple[List[Entry], List[Entry]]:
+    """(page entries, child sitemaps) of a sitemap, sitemap index, RSS or Atom document."""
+    root = _xml_root(body)
+    if root is None:
+        return [], []
+    kind = _local(root.tag)
+    pages: List[Entry] = []
+    children: List[Entry] = []
+    if kind in ("urlset", "sitemapindex"):
+        out = pages if kind == "urlset" else children
+        for node in root:
+            loc = _child_text(node, "loc")
+            if loc:
+                out.append(Entry(urljoin(base_url, loc), parse_lastmod(_child_text(node, "lastmod"))))
+    elif kind == "rss":
+        for item in root.iter():
+            if _local(item.tag) == "item":
+                link = _child_text(item, "link")
+                if link:
+                    pages.append(Entry(urljoin(base_url, link), parse_lastmod(_child_text(item, "pubdate"))))
+    elif kind == "feed":
+        for entry in root:
+            if _local(entry.tag) != "entry":
+                continue
+            href = next((c.get("href") for c in entry if _local(c.tag) == "link"
+                         and c.get("rel", "alternate") == "alternate"), None)
+            if href:
+                when = _child_text(entry, "updated") or _child_text(entry, "published")
+                pages.append(Entry(urljoin(base_url, href), parse_lastmod(when)))
+    return pages, children
+
+def sitemaps_in_robots(text: str, base_url: str) -> List[str]:
+    return [urljoin(base_url, line.split(":", 1)[1].strip())
+            for line in text.splitlines() if line.lower().startswith("sitemap:")]
+
+def feed_links(soup, base_url: str) -> List[str]:
+    """RSS/Atom feeds a landing page advertises with <link rel="alternate">."""
+    return [urljoin(base_url, ln["href"]) for ln in soup.select("link[rel~=alternate][href]")
+            if (ln.get("type") or "").lower() in FEED_TYPES]
+
+# -------- Discovery --------
+
+# robots.txt sitemaps per host for the whole run; several councils can share a CMS host
+_robots: Dict[str, List[str]] = {}
+_robots_lock = threading.Lock()
+
+def _fetch(get: Callable[[str], "requests.Response"], url: str) -> Optional[bytes]:
+    try:
+        r = get(url)
+    except Exception as e:
+        import requests   # already loaded by get()
+        from capture import ReplayMiss
+        if isinstance(e, ReplayMiss):
+            return None   # the captured run never probed this URL
+        if not isinstance(e, requests.RequestException):
+            raise         # deadline, open breaker
+        # 404 and friends just mean "no sitemap here"; an unreachable probe must not fail the source
+        logging.debug("discovery: %s unavailable (%s)", url, e)
+        return None
+    return r.content
+
+def candidates(get: Callable[[str], "requests.Response"], start_url: str, setting: str) -> List[str]:
+    """Sitemap/feed URLs to try for a source, per its tuning `discovery` setting."""
+    if setting not in ("auto", ""):
+        return [setting]
+    parts = urlsplit(start_url)
+    root = f"{parts.scheme}://{parts.netloc}/"
+    with _robots_lock:
+        known = _robots.get(parts.netloc)
+    if known is None:
+        body = _fetch(get, urljoin(root, "robots.txt"))
+        known = sitemaps_in_robots(body.decode("utf-8", "replace"), root) if body else []
+        with _robots_lock:
+            _robots[parts.netloc] = known
+    return known or [urljoin(root, "sitemap.xml")]
+
+def read_entries(get: Callable[[str], "requests.Response"], url: str) -> List[Entry]:
+    """Page entries of a sitemap/feed URL, following a sitemap index one level down."""
+    body = _fetch(get, url)
+    if not body:
+        return []
+    pages, children = parse_document(body, url)
+    if children:
+        jobby = [c for c in children if JOB_HINT_RE.search(c.url)]
+        for child in jobby or children[:MAX_CHILD_SITEMAPS]:
+            child_body = _fetch(get, child.url)
+            if child_body:
+                pages += parse_document(child_body, child.url)[0]
+    return pages
+
+def job_entries(entries: List[Entry], start_url: str, now: Optional[dt.datetime] = None) -> List[Entry]:
+    """Job-like entries in the start URL's section that are not long expired; latest lastmod per URL."""
+    cutoff = (now or dt.datetime.now(dt.UTC)) - dt.timedelta(days=MAX_AGE_DAYS)
+    out: Dict[str, Entry] = {}
+    for e in entries:
+        if not in_section(e.url, start_url) or not looks_like_job(e.url):
+            continue
+        if e.lastmod is not None and e.lastmod < cutoff:
+            continue
+        prev = out.get(e.url)
+        if prev is None or (e.lastmod and (prev.lastmod is None or e.lastmod > prev.lastmod)):
+            out[e.url] = e
+    return list(out.values())
+
+def discover(get: Callable[[str], "requests.Response"], start_url: str, setting: str = "auto") -> List[Entry]:
+    """Job entries from the source's sitemap or feed; empty when it has none (crawl anchors instead)."""
+    if setting == "off":
+        return []
+    for url in candidates(get, start_url, setting):
+        found = job_entries(read_entries(get, url), start_url)
+        if found:
+            logging.debug("discovery: %d job URL(s) from %s", len(found), url)
+            return found
+    return []
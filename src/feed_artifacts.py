@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feed_artifacts.py
+Size-optimised feed artifacts: text summaries for compact feeds, a JSON Feed
+(https://jsonfeed.org/version/1.1) variant, precompressed .gz/.br siblings
+and a per-run size report checked against a byte budget.
+
+Brotli (requirements.txt) is imported on first use, so building feeds
+without --compress does not load it.
+"""
+
+import datetime as dt
+import gzip
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import feed_delta
+
+SUMMARY_CHARS = 280
+
+# -------- Compact summaries --------
+
+def text_summary(rec: Dict, limit: int = SUMMARY_CHARS) -> str:
+    text = feed_delta.clean_description(rec.get("description_html"))
+    if not text:
+        parts = [rec.get("council"), rec.get("salary"), rec.get("band")]
+        return " — ".join(p for p in parts if p)
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,.;:—-") + "…"
+
+# -------- JSON Feed --------
+
+def json_feed(items: Iterable[Dict], title: str, feed_url: str, desc: str,
+              guid_fn: Callable[[Dict], str], date_fn: Callable[[Dict], dt.datetime]) -> Dict:
+    out_items = []
+    for rec in items:
+        entry = {
+            "id": guid_fn(rec),
+            "url": rec.get("link") or "",
+            "title": rec.get("title") or "(untitled)",
+            "content_text": text_summary(rec),
+            "date_published": date_fn(rec).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "_bandsight": {k: rec.get(k) for k in (
+                "council", "salary", "salary_min", "salary_max", "salary_period", "band", "closing_date",
+                "employment_type", "location", "source_engine",
+            ) if rec.get(k)},
+        }
+        if rec.get("band"):
+            entry["tags"] = [rec["band"]]
+        out_items.append(entry)
+    return {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": title,
+        "home_page_url": feed_url.rsplit("/", 1)[0] + "/",
+        "feed_url": feed_url,
+        "description": desc,
+        "language": "en-AU",
+        "items": out_items,
+    }
+
+def dump_json_feed(feed: Dict) -> str:
+    return json.dumps(feed, ensure_ascii=False, separators=(",", ":"))
+
+# -------- Precompression --------
+
+def write_compressed(path: Path) -> List[Path]:
+    """
+    Write deterministic .gz (mtime 0) and .br siblings of path, so unchanged
+    inputs produce byte-identical outputs. A sibling is only rewritten when
+    it is missing or older than path; returns the siblings written.
+    """
+    import brotli
+    mtime = path.stat().st_mtime
+    stale = [sib for sib in (path.with_name(path.name + ".gz"), path.with_name(path.name + ".br"))
+             if not sib.exists() or sib.stat().st_mtime < mtime]
+    if not stale:
+        return []
+    data = path.read_bytes()
+    for sib in stale:
+        if sib.suffix == ".gz":
+            sib.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        else:
+            sib.write_bytes(brotli.compress(data, quality=11))
+    return stale
+
+# -------- Size report --------
+
+def size_report(paths: Iterable[Path], budget: Optional[int] = None) -> Dict:
+    files = {}
+    over = []
+    for p in paths:
+        if not p.exists():
+            continue
+        row = {"bytes": p.stat().st_size}
+        for ext in ("gz", "br"):
+            sib = p.with_name(f"{p.name}.{ext}")
+            if sib.exists():
+                row[ext] = sib.stat().st_size
+        files[p.as_posix()] = row
+        if budget and row["bytes"] > budget:
+            over.append(p.as_posix())
+    return {"budget_bytes": budget, "over_budget": over, "files": files}
+
+def write_size_report(path: Path, report: Dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=1, sort_keys=True) + "\n", encoding="utf-8")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feed_cache.py
+Rendered <item> fragment cache for feeds_site_builder.
+
+Fragments are keyed by "<item_guid>:<content hash>", where the content hash
+covers every field the item renders from, so an unchanged record is reused
+verbatim and an edited one is re-rendered. Only entries used by the latest
+build are saved, which keeps the cache the size of one feed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Optional, TextIO
+
+RENDER_FIELDS = (
+    "council", "title", "link", "band", "salary", "closing_date",
+    "description_html", "posted_date",
+)
+
+RENDER_FORMAT = 3  # bump when render_item's output changes, so stale fragments miss
+_BUILD_DATE_RE = re.compile(r"<lastBuildDate>[^<]*</lastBuildDate>")
+
+def content_key(rec: Dict) -> str:
+    fields = [RENDER_FORMAT] + [rec.get(k) for k in RENDER_FIELDS]
+    if not rec.get("posted_date"):
+        fields.append(rec.get("first_seen") or rec.get("scrape_date"))  # pubDate falls back to it
+    blob = "\x1f".join("" if v is None else str(v) for v in fields)
+    return hashlib.sha1(blob.encode("utf-8", "surrogatepass")).hexdigest()
+
+class RenderCache:
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.entries: Dict[str, str] = {}
+        self.used: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        if path and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if isinstance(data, dict):
+                    self.entries = data
+            except (OSError, json.JSONDecodeError):
+                self.entries = {}
+
+    def fragment(self, guid: str, rec: Dict, render: Callable[[Dict], str]) -> str:
+        key = f"{guid}:{content_key(rec)}"
+        frag = self.used.get(key) or self.entries.get(key)
+        if frag is None:
+            frag = render(rec)
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.used[key] = frag
+        return frag
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.used, ensure_ascii=False), encoding="utf-8")
+
+def _same_feed(a: Path, b: Path) -> bool:
+    # RFC 2822 build dates have a fixed width, so a size difference is a content difference
+    if a.stat().st_size != b.stat().st_size:
+        return False
+    return (_BUILD_DATE_RE.sub("", a.read_text(encoding="utf-8"), count=1)
+            == _BUILD_DATE_RE.sub("", b.read_text(encoding="utf-8"), count=1))
+
+def write_if_changed(path: Path, render: Callable[[TextIO], None]) -> bool:
+    """
+    Stream render's output into a temporary file next to path, then keep it
+    unless it differs from the existing file only in <lastBuildDate>.
+    Returns True when path was (re)written.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            render(f)
+        if path.exists() and _same_feed(path, tmp):
+            tmp.unlink()
+            return False
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, path)
+    return True
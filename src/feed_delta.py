@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feed_delta.py
+Per-job content fingerprints and new/changed/removed deltas between builds.
+
+A fingerprint is a sha1 over the fields subscribers care about (title, salary,
+band, closing_date and the tag-stripped description). The builder keeps the
+previous run's fingerprints in a small JSON snapshot and diffs against it:
+
+  {"guid": {"fp": "<sha1>", "council": …, "title": …, "link": …,
+            "salary": …, "band": …, "closing_date": …}}
+
+Changes are kept in a rolling JSON Lines log, one object per change:
+
+  {"change": "new|changed|removed", "guid": …, "fp": …, "fields": [...],
+   "council": …, "title": …, "link": …, "detected_at": "2025-11-01T18:45:52Z"}
+"""
+
+import datetime as dt
+import hashlib
+import html
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+FINGERPRINT_FIELDS = ("title", "salary", "band", "closing_date")
+RUN_SLACK = dt.timedelta(hours=2)  # records this close to a council's newest scrape belong to the same run
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+# -------- Fingerprints --------
+
+def clean_description(x: Optional[str]) -> str:
+    if not x:
+        return ""
+    t = html.unescape(_TAG_RE.sub(" ", x))
+    return _WS_RE.sub(" ", t).strip()
+
+def fingerprint(rec: Dict) -> str:
+    parts = [(rec.get(k) or "").strip() for k in FINGERPRINT_FIELDS]
+    parts.append(clean_description(rec.get("description_html")))
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+def _scraped_at(rec: Dict) -> Optional[dt.datetime]:
+    sd = rec.get("scrape_date")
+    if not sd:
+        return None
+    try:
+        d = dt.datetime.fromisoformat(sd)
+    except ValueError:
+        return None
+    if d.tzinfo is None:
+        d = d.replace(tzinfo=dt.UTC)
+    return d
+
+def latest_run(rows: Iterable[Dict]) -> List[Dict]:
+    """
+    Keep only each council's most recent scrape run. A council that failed in
+    the latest run keeps its previous listing rather than appearing removed.
+    """
+    rows = list(rows)
+    newest: Dict[str, dt.datetime] = {}
+    for r in rows:
+        d = _scraped_at(r)
+        c = r.get("council") or ""
+        if d and (c not in newest or d > newest[c]):
+            newest[c] = d
+    out = []
+    for r in rows:
+        d = _scraped_at(r)
+        c = r.get("council") or ""
+        if d is None or c not in newest or d >= newest[c] - RUN_SLACK:
+            out.append(r)
+    return out
+
+def latest_by_guid(rows: Iterable[Dict], guid_fn: Callable[[Dict], str]) -> Dict[str, Dict]:
+    out: Dict[str, Dict] = {}
+    for r in rows:
+        g = guid_fn(r)
+        prev = out.get(g)
+        if prev is None or (r.get("scrape_date") or "") >= (prev.get("scrape_date") or ""):
+            out[g] = r
+    return out
+
+def snapshot_of(current: Dict[str, Dict]) -> Dict[str, Dict]:
+    snap = {}
+    for guid, rec in current.items():
+        entry = {"fp": fingerprint(rec), "council": rec.get("council"), "link": rec.get("link")}
+        for k in FINGERPRINT_FIELDS:
+            entry[k] = rec.get(k)
+        snap[guid] = entry
+    return snap
+
+# -------- Delta --------
+
+def compute_delta(previous: Dict[str, Dict], snapshot: Dict[str, Dict], detected_at: str) -> List[Dict]:
+    changes: List[Dict] = []
+    for guid, cur in snapshot.items():
+        prev = previous.get(guid)
+        if prev is None:
+            kind, fields = "new", []
+        elif prev.get("fp") != cur["fp"]:
+            kind = "changed"
+            fields = [k for k in FINGERPRINT_FIELDS if prev.get(k) != cur.get(k)] or ["description"]
+        else:
+            continue
+        changes.append({
+            "change": kind, "guid": guid, "fp": cur["fp"], "fields": fields,
+            "council": cur.get("council"), "title": cur.get("title"), "link": cur.get("link"),
+            "detected_at": detected_at,
+        })
+    for guid, prev in previous.items():
+        if guid in snapshot:
+            continue
+        changes.append({
+            "change": "removed", "guid": guid, "fp": prev.get("fp"), "fields": [],
+            "council": prev.get("council"), "title": prev.get("title"), "link": prev.get("link"),
+            "detected_at": detected_at,
+        })
+    return changes
+
+# -------- Persistence --------
+
+def load_snapshot(path: Path) -> Dict[str, Dict]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def save_snapshot(path: Path, snapshot: Dict[str, Dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(snapshot, ensure_ascii=False, sort_keys=True, indent=0), encoding="utf-8")
+
+def read_changes(path: Path) -> List[Dict]:
+    if not path.exists():
+        return []
+    out = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                out.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return out
+
+def write_changes(path: Path, log: List[Dict], keep_days: int) -> List[Dict]:
+    """Rewrite the rolling change log, dropping entries older than keep_days."""
+    if keep_days > 0:
+        cutoff = (dt.datetime.now(dt.UTC) - dt.timedelta(days=keep_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        log = [c for c in log if (c.get("detected_at") or "") >= cutoff]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for c in log:
+            f.write(json.dumps(c, ensure_ascii=False) + "\n")
+    return log
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feed_paging.py
+RFC 5005 ("Feed Paging and Archiving") archived feeds for feeds_site_builder.
+
+The subscription document (the head page) holds the newest items. Once more
+than head_items + page_items items are pending, the oldest page_items are
+frozen into the next archive page. Archive pages are written once and never
+rebuilt; only the head page changes between runs. Only open jobs (listed
+in the open-jobs snapshot, or not past their closing date) are paged; a job
+that closes before it is archived drops out of the feed. Every other job
+appears in exactly one document.
+
+manifest.json in the archive directory records what has been archived:
+  {"pages": [{"n": 1, "path": "page-1.xml", "items": 100, "guids": [...]}],
+   "pending_since": "2026-09-02"}
+
+Every open job in the history is either archived or on the head page, and a
+job's latest record cannot be older than its last scrape. pending_since is
+the oldest scrape day among the head page's records. The next build only
+needs the history from that day on (plus anything appended since), so its
+read does not grow with the history.
+"""
+
+import json
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+FH_NS = "http://purl.org/syndication/history/1.0"
+NAMESPACES = {"atom": ATOM_NS, "fh": FH_NS}
+
+def page_name(n: int) -> str:
+    return f"page-{n}.xml"
+
+def load_manifest(archive_dir: Path) -> Dict:
+    p = archive_dir / "manifest.json"
+    if not p.exists():
+        return {"pages": []}
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {"pages": []}
+    return data if isinstance(data, dict) and "pages" in data else {"pages": []}
+
+def save_manifest(archive_dir: Path, manifest: Dict) -> None:
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    (archive_dir / "manifest.json").write_text(json.dumps(manifest, indent=1) + "\n", encoding="utf-8")
+
+def archived_guids(manifest: Dict) -> Set[str]:
+    out: Set[str] = set()
+    for page in manifest.get("pages") or []:
+        out.update(page.get("guids") or [])
+    return out
+
+def pending_since(head: List[Tuple[str, Dict]]) -> Optional[str]:
+    """Oldest scrape day on the head page; None (read everything next time) if any record lacks one."""
+    days = [(r.get("scrape_date") or "")[:10] for _, r in head]
+    if not days or not all(days):
+        return None
+    return min(days)
+
+def plan(pending_oldest_first: List[Tuple[str, Dict]], head_items: int,
+         page_items: int) -> Tuple[List[List[Tuple[str, Dict]]], List[Tuple[str, Dict]]]:
+    """Split pending (guid, record) pairs into new archive pages and the head page."""
+    pages = []
+    pending = list(pending_oldest_first)
+    while page_items > 0 and len(pending) > head_items + page_items:
+        pages.append(pending[:page_items])
+        pending = pending[page_items:]
+    return pages, pending
+
+def atom_link(rel: str, href: str) -> str:
+    return f'<atom:link rel="{rel}" href="{escape(href)}"/>'
+
+def head_links(self_href: str, last_archive_href: str = "") -> List[str]:
+    out = [atom_link("self", self_href)]
+    if last_archive_href:
+        out.append(atom_link("prev-archive", last_archive_href))
+    return out
+
+def archive_links(current_href: str, self_href: str, prev_href: str = "") -> List[str]:
+    out = ["<fh:archive/>", atom_link("current", current_href), atom_link("self", self_href)]
+    if prev_href:
+        out.append(atom_link("prev-archive", prev_href))
+    return out
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feed_partitions.py
+Splits the feed into per-council, per-band and per-engine partitions in one pass.
+
+Layout under the partitions directory:
+  council/<lga_code or slug>.xml
+  band/<band slug>.xml
+  engine/<source_engine>.xml
+  index.json   [{kind, key, label, path, items}, ...]
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PARTITION_KINDS = ("council", "band", "engine")
+
+Partition = Tuple[str, str]  # (kind, key)
+
+def slugify(x: str) -> str:
+    return re.sub(r"[^a-z0-9_]+", "-", x.lower()).strip("-")
+
+def load_council_codes(path: Optional[str]) -> Dict[str, str]:
+    """Map council name -> partition key (lga_code when the registry has one)."""
+    if not path or not Path(path).exists():
+        return {}
+    import registry
+    try:
+        councils = registry.load_councils(path)
+    except RuntimeError:  # PyYAML missing; fall back to name slugs
+        return {}
+    out: Dict[str, str] = {}
+    for c in councils:
+        if not c["name"] or not c["active"]:
+            continue
+        out[c["name"]] = str(c["lga_code"]) if c["lga_code"] is not None else slugify(c["name"])
+    return out
+
+def partitions_of(rec: Dict, codes: Dict[str, str]) -> List[Tuple[str, str, str]]:
+    """(kind, key, label) for every partition the record belongs to."""
+    out = []
+    council = (rec.get("council") or "").strip()
+    if council:
+        out.append(("council", codes.get(council) or slugify(council), council))
+    band = (rec.get("band") or "").strip()
+    if band:
+        out.append(("band", slugify(band), band.title()))
+    engine = (rec.get("source_engine") or "").strip()
+    if engine:
+        out.append(("engine", slugify(engine), engine))
+    return out
+
+def partition(items_sorted: Iterable[Dict], codes: Dict[str, str], cap: int) -> Dict[Partition, Dict]:
+    """
+    Bucket already-sorted records into every partition in a single pass,
+    keeping at most `cap` per partition. Registry councils without any
+    records still get an (empty) partition so their feed URL stays valid.
+    """
+    buckets: Dict[Partition, Dict] = {}
+    for name, code in codes.items():
+        buckets[("council", code)] = {"label": name, "items": []}
+    for rec in items_sorted:
+        for kind, key, label in partitions_of(rec, codes):
+            b = buckets.setdefault((kind, key), {"label": label, "items": []})
+            if len(b["items"]) < cap:
+                b["items"].append(rec)
+    return buckets
+
+def partition_path(kind: str, key: str) -> str:
+    return f"{kind}/{key}.xml"
+
+def write_index(path: Path, entries: List[Dict]) -> None:
+    entries = sorted(entries, key=lambda e: (PARTITION_KINDS.index(e["kind"]), e["key"]))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(entries, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
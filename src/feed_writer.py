@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+feed_writer.py
+Streaming RSS 2.0 writer for feeds_site_builder.
+
+Plain text is XML-escaped. Description HTML goes into CDATA, so its markup
+is not escaped a second time. Bandsight's job fields (salary, closing date,
+council) use their own namespace:
+
+  <rss version="2.0" xmlns:bandsight="https://bandsight.github.io/ns/jobs/1.0">
+  …<bandsight:salary>$95,760</bandsight:salary>…
+
+With validate=True the document is parsed as it is written, by one
+incremental expat parser. A malformed item then fails the build at that
+item, instead of the feed being published and rejected by readers.
+Validation roughly doubles the cost of a cold build, so the builder only
+turns it on with --validate.
+"""
+
+import re
+from typing import Dict, List, Optional, TextIO
+from xml.parsers import expat
+
+BANDSIGHT_NS = "https://bandsight.github.io/ns/jobs/1.0"
+
+# characters XML 1.0 does not allow anywhere, not even in CDATA
+_INVALID_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+class FeedError(ValueError):
+    pass
+
+_CONTROL_BYTES = bytes(c for c in range(32) if c not in (9, 10, 13))
+
+def _valid_chars(x: str) -> str:
+    # Short fields: one regex search is cheapest. Long ones (descriptions): bytes.translate is
+    # several times quicker than a regex scan. ASCII control bytes never occur inside
+    # multi-byte UTF-8 sequences, so the byte check is exact.
+    if len(x) < 256:
+        return x if _INVALID_XML_RE.search(x) is None else _INVALID_XML_RE.sub("", x)
+    b = x.encode("utf-8", "surrogatepass")
+    if len(b.translate(None, _CONTROL_BYTES)) == len(b) and "\ufffe" not in x and "\uffff" not in x:
+        return x
+    return _INVALID_XML_RE.sub("", x)
+
+def text(x: Optional[str]) -> str:
+    if not x:
+        return ""
+    return _valid_chars(x).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def attr(x: Optional[str]) -> str:
+    return text(x).replace('"', "&quot;")
+
+def cdata(x: Optional[str]) -> str:
+    if not x:
+        return ""
+    return "<![CDATA[" + _valid_chars(x).replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+def element(name: str, value: Optional[str]) -> str:
+    return f"<{name}>{text(value)}</{name}>"
+
+def cdata_element(name: str, value: Optional[str]) -> str:
+    return f"<{name}>{cdata(value)}</{name}>"
+
+def truncate_html(html: str, limit: int) -> str:
+    """html cut to at most limit characters, never inside a tag or an entity."""
+    if len(html) <= limit:
+        return html
+    cut = html[:limit]
+    lt, amp = cut.rfind("<"), cut.rfind("&")
+    if lt > cut.rfind(">"):
+        cut = cut[:lt]
+    if amp > cut.rfind(";") and len(cut) - amp <= 10:  # an entity cut short
+        cut = cut[:amp]
+    return cut
+
+class FeedWriter:
+    """
+    Writes one RSS document to a text sink: open(), any number of item(),
+    close(). Items are pre-rendered fragments (see feeds_site_builder.render_item),
+    so cached fragments stream straight through.
+    """
+    def __init__(self, out: TextIO, validate: bool = False):
+        self.out = out
+        self.items = 0
+        self._parser = expat.ParserCreate() if validate else None
+
+    def _write(self, chunk: str, where: str) -> None:
+        if self._parser is not None:
+            try:
+                self._parser.Parse(chunk, False)
+            except expat.ExpatError as e:
+                raise FeedError(f"{where} is not well-formed: {e}\n{chunk[:200]}") from None
+        self.out.write(chunk)
+
+    def open(self, title: str, link: str, desc: str, build_date: str,
+             namespaces: Optional[Dict[str, str]] = None, extra: Optional[List[str]] = None) -> None:
+        """namespaces: extra prefix -> URI declarations; extra: channel-level elements (e.g. paging links)."""
+        ns = {"bandsight": BANDSIGHT_NS, **(namespaces or {})}
+        decls = "".join(f' xmlns:{p}="{attr(uri)}"' for p, uri in ns.items())
+        head = "\n".join([
+            f'<rss version="2.0"{decls}>',
+            "<channel>",
+            element("title", title),
+            element("link", link),
+            element("description", desc),
+            "<language>en-au</language>",
+            element("lastBuildDate", build_date),
+        ] + (extra or []))
+        self._write('<?xml version="1.0" encoding="UTF-8"?>\n' + head + "\n", "channel head")
+
+    def item(self, fragment: str) -> None:
+        self._write(fragment + "\n", f"item {self.items + 1}")
+        self.items += 1
+
+    def close(self) -> None:
+        self._write("</channel>\n</rss>", "channel")
+        if self._parser is not None:
+            try:
+                self._parser.Parse("", True)
+            except expat.ExpatError as e:
+                raise FeedError(f"feed is not well-formed at its end: {e}") from None
@@ -6,20 +6,31 @@ Builds an RSS 2.0 feed from a JSONL history produced by scraper.py
 
 Usage:
   python src/feeds_site_builder.py --in data/jobs_history.jsonl --out feeds/feed.xml --days 45
+  python src/feeds_site_builder.py --in data/jobs_history.jsonl --out feeds/feed.xml \
+      --changes feeds/changes.jsonl --delta-out feeds/delta.xml
 """
 
 import argparse
 import datetime as dt
-import hashlib
-import html
 import json
+from contextlib import nullcontext
 from email.utils import formatdate
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, TextIO
+
+import feed_artifacts
+import feed_delta
+import feed_paging
+import seen_store
+from feed_cache import RenderCache, write_if_changed
+from feed_writer import FeedWriter, cdata_element, element, truncate_html
 
 AUS_TZ = dt.timezone(dt.timedelta(hours=11))  # Melbourne AEDT
+DESCRIPTION_CHARS = 4000
+# parse every feed as it is written and fail on malformed XML (--validate)
+VALIDATE = False
 
-def parse_args():
+def parse_args(argv: Optional[List[str]] = None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="inp", required=True, help="Input JSONL (scraper output)")
     ap.add_argument("--out", dest="outp", required=True, help="Output RSS XML path")
@@ -28,7 +39,50 @@ def parse_args():
     ap.add_argument("--desc", default="Automatically updated jobs feed by Bandsight.")
     ap.add_argument("--max_items", type=int, default=300)
     ap.add_argument("--days", type=int, default=45, help="Only include jobs within last N days")
-    return ap.parse_args()
+    ap.add_argument("--window-margin-days", dest="window_margin_days", type=float, default=2.0,
+                    help="Extra days of history read beyond --days, for lines appended out of order")
+    ap.add_argument("--history-index", dest="history_index", action="store_true",
+                    help="Keep a sidecar <in>.idx.json of byte offsets by scrape day for exact windowed reads")
+    ap.add_argument("--open-jobs", dest="open_jobs", default=None,
+                    help="Render from this open-jobs snapshot (see open_jobs.py) instead of the history window; "
+                         "seeded from --in when missing. Paging (--archive-dir) reads the history back to its oldest pending item")
+    ap.add_argument("--changes", default=None, help="Rolling change log (JSONL); enables delta detection")
+    ap.add_argument("--fingerprints", default="data/fingerprints.json",
+                    help="Previous run's per-job fingerprints (used with --changes)")
+    ap.add_argument("--delta-out", dest="delta_out", default=None, help="Output RSS of new and updated jobs only")
+    ap.add_argument("--delta-days", dest="delta_days", type=int, default=7,
+                    help="Days of changes kept in the change log and delta feed")
+    ap.add_argument("--render-cache", dest="render_cache", default=None,
+                    help="Rendered item cache (JSON); unchanged items are reused between builds")
+    ap.add_argument("--partitions-dir", dest="partitions_dir", default=None,
+                    help="Also write per-council, per-band and per-engine feeds plus index.json here")
+    ap.add_argument("--partition-max-items", dest="partition_max_items", type=int, default=100)
+    ap.add_argument("--councils", default="data/councils.yaml",
+                    help="Registry used to key council partitions by lga_code")
+    ap.add_argument("--search-dir", dest="search_dir", default=None,
+                    help="Also write a static search index of open jobs (term shards, facets, docs) here")
+    ap.add_argument("--search-state", dest="search_state", default=".cache/search_state.json",
+                    help="Doc IDs and tokens kept between builds so the search index updates incrementally")
+    ap.add_argument("--archive-dir", dest="archive_dir", default=None,
+                    help="RFC 5005 paging: --out becomes the head page and older items are frozen into "
+                         "immutable archive pages here (covers the whole history, ignores --days/--max_items)")
+    ap.add_argument("--head-items", dest="head_items", type=int, default=50)
+    ap.add_argument("--page-items", dest="page_items", type=int, default=100)
+    ap.add_argument("--compact-out", dest="compact_out", default=None,
+                    help="Also write a compact RSS with plain-text description summaries")
+    ap.add_argument("--json-out", dest="json_out", default=None, help="Also write a JSON Feed 1.1 variant")
+    ap.add_argument("--compress", action="store_true", help="Write precompressed .gz/.br siblings of each feed")
+    ap.add_argument("--size-report", dest="size_report", default=None, help="Write a JSON size report here")
+    ap.add_argument("--seen-db", dest="seen_db", default=None,
+                    help="Seen-state store (SQLite) shared with the scraper; pubDate falls back to "
+                         "first_seen instead of the latest scrape_date. Seeded from --in when empty")
+    ap.add_argument("--profile", default=None, metavar="DIR",
+                    help="Profile each build step (cProfile); write .pstats and profile.json to DIR")
+    ap.add_argument("--size-budget", dest="size_budget", type=int, default=0,
+                    help="Warn when any feed artifact exceeds this many bytes (0 = no budget)")
+    ap.add_argument("--validate", action="store_true",
+                    help="Check every feed is well-formed XML while writing it (slower; fails the build)")
+    return ap.parse_args(argv)
 
 def read_jsonl(path: Path) -> Iterable[Dict]:
     if not path.exists():
@@ -43,113 +97,336 @@ def read_jsonl(path: Path) -> Iterable[Dict]:
             except Exception:
                 continue
 
-def within_window(rec: Dict, days: int) -> bool:
+def within_window(rec: Dict, days: int, cutoff: Optional[dt.datetime] = None) -> bool:
+    """cutoff: precomputed now - days, to avoid recomputing it per record."""
     if days <= 0:
         return True
-    cutoff = dt.datetime.now(dt.UTC) - dt.timedelta(days=days)
-    pd = rec.get("posted_date")
-    if pd:
-        try:
-            d = dt.datetime.fromisoformat(pd + "T00:00:00+11:00").astimezone(dt.UTC)
-            return d >= cutoff
-        except Exception:
-            pass
-    sd = rec.get("scrape_date")
-    if sd:
-        try:
-            d = dt.datetime.fromisoformat(sd)
-            if d.tzinfo is None:
-                d = d.replace(tzinfo=AUS_TZ)
-            d = d.astimezone(dt.UTC)
-            return d >= cutoff
-        except Exception:
-            pass
-    return True
-
-def sanitize_text(x: Optional[str]) -> str:
-    return "" if not x else html.escape(x, quote=False)
+    return published_at(rec) >= (cutoff or dt.datetime.now(dt.UTC) - dt.timedelta(days=days))
 
 def item_guid(rec: Dict) -> str:
-    base = (rec.get("council") or "") + "|" + (rec.get("link") or "")
-    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+    return seen_store.record_guid(rec)
 
 def as_rfc2822(dt_utc: dt.datetime) -> str:
     return formatdate(dt_utc.timestamp(), usegmt=True)
 
-def pubdate_for(rec: Dict) -> str:
+def published_at(rec: Dict) -> dt.datetime:
+    """posted_date, else when the job was first seen (see --seen-db), else its scrape_date."""
     pd = rec.get("posted_date")
     if pd:
         try:
-            d = dt.datetime.fromisoformat(pd + "T00:00:00+11:00").astimezone(dt.UTC)
-            return as_rfc2822(d)
+            return dt.datetime.fromisoformat(pd + "T00:00:00+11:00").astimezone(dt.UTC)
         except Exception:
             pass
-    sd = rec.get("scrape_date")
+    sd = rec.get("first_seen") or rec.get("scrape_date")
     if sd:
         try:
             d = dt.datetime.fromisoformat(sd)
             if d.tzinfo is None:
                 d = d.replace(tzinfo=AUS_TZ)
-            return as_rfc2822(d.astimezone(dt.UTC))
+            return d.astimezone(dt.UTC)
         except Exception:
             pass
-    return as_rfc2822(dt.datetime.now(dt.UTC))
+    return dt.datetime.now(dt.UTC)
 
-def build(items: List[Dict], title: str, link: str, desc: str, max_items: int) -> str:
-    now = as_rfc2822(dt.datetime.now(dt.UTC))
+def pubdate_for(rec: Dict) -> str:
+    return as_rfc2822(published_at(rec))
+
+def render_item(rec: Dict, guid: Optional[str] = None, pubdate: Optional[str] = None,
+                compact: bool = False) -> List[str]:
+    council = rec.get("council") or ""
+    title = rec.get("title") or "(untitled)"
+    link = rec.get("link") or ""
+    band = rec.get("band") or ""
+    salary = rec.get("salary") or ""
+    closing = rec.get("closing_date") or ""
+    desc_html = rec.get("description_html") or ""
     parts = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<rss version="2.0">',
-        "<channel>",
-        f"<title>{sanitize_text(title)}</title>",
-        f"<link>{sanitize_text(link)}</link>",
-        f"<description>{sanitize_text(desc)}</description>",
-        "<language>en-au</language>",
-        f"<lastBuildDate>{now}</lastBuildDate>",
+        "<item>",
+        element("title", title),
+        element("link", link),
+        f"<guid isPermaLink=\"false\">{guid or item_guid(rec)}</guid>",
+        f"<pubDate>{pubdate or pubdate_for(rec)}</pubDate>",
     ]
+    if band:
+        parts.append(element("category", band))
+    if salary:
+        parts.append(element("bandsight:salary", salary))
+    if closing:
+        parts.append(element("bandsight:closing", closing))
+    if council:
+        parts.append(element("bandsight:council", council))
+    if compact or not desc_html:
+        summary = feed_artifacts.text_summary(rec) if compact else \
+            " — ".join([p for p in [council, salary, band] if p]).strip(" —")
+        parts.append(element("description", summary[:DESCRIPTION_CHARS]))
+    else:
+        parts.append(cdata_element("description", truncate_html(desc_html, DESCRIPTION_CHARS)))
+    parts.append("</item>")
+    return parts
 
-    items_sorted = sorted(
+def sort_items(items: Iterable[Dict]) -> List[Dict]:
+    return sorted(
         items,
-        key=lambda r: (r.get("posted_date") or r.get("scrape_date") or ""),
+        key=lambda r: (r.get("posted_date") or r.get("first_seen") or r.get("scrape_date") or ""),
         reverse=True,
     )
-    for rec in items_sorted[:max_items]:
-        council = rec.get("council") or ""
-        title = rec.get("title") or "(untitled)"
-        link = rec.get("link") or ""
-        band = rec.get("band") or ""
-        salary = rec.get("salary") or ""
-        closing = rec.get("closing_date") or ""
-        desc_html = rec.get("description_html") or ""
-        summary = desc_html or sanitize_text(" — ".join([p for p in [council, salary, band] if p]).strip(" —"))
-
-        parts += [
-            "<item>",
-            f"<title>{sanitize_text(title)}</title>",
-            f"<link>{sanitize_text(link)}</link>",
-            f"<guid isPermaLink=\"false\">{item_guid(rec)}</guid>",
-            f"<pubDate>{pubdate_for(rec)}</pubDate>",
-        ]
-        if band:
-            parts.append(f"<category>{sanitize_text(band)}</category>")
-        if salary:
-            parts.append(f"<salary>{sanitize_text(salary)}</salary>")
-        if closing:
-            parts.append(f"<closing>{sanitize_text(closing)}</closing>")
-        if council:
-            parts.append(f"<council>{sanitize_text(council)}</council>")
-        parts.append(f"<description>{sanitize_text(summary[:4000])}</description>")
-        parts.append("</item>")
-
-    parts += [f"<lastBuildDate>{now}</lastBuildDate>", "</channel>", "</rss>"]
-    return "\n".join(parts)
-
-def main():
-    args = parse_args()
-    rows = [r for r in read_jsonl(Path(args.inp)) if within_window(r, args.days)]
-    xml = build(rows, args.title, args.link, args.desc, args.max_items)
-    Path(args.outp).write_text(xml, encoding="utf-8")
-    print(f"Wrote RSS with {min(len(rows), args.max_items)} items to {args.outp}")
+
+def build(items: List[Dict], title: str, link: str, desc: str, max_items: int, out: TextIO,
+          cache: Optional[RenderCache] = None, compact: bool = False,
+          extra: Optional[List[str]] = None) -> None:
+    """Stream the feed to out. extra: RFC 5005 paging elements; declares the atom/fh namespaces when given."""
+    w = FeedWriter(out, validate=VALIDATE)
+    w.open(title, link, desc, as_rfc2822(dt.datetime.now(dt.UTC)),
+           namespaces=feed_paging.NAMESPACES if extra else None, extra=extra)
+    for rec in sort_items(items)[:max_items]:
+        if cache is None:
+            w.item("\n".join(render_item(rec, compact=compact)))
+        else:
+            guid = item_guid(rec)
+            key = guid + ":compact" if compact else guid
+            frag = cache.fragment(key, rec, lambda r: "\n".join(render_item(r, guid=guid, compact=compact)))
+            w.item(frag)
+    w.close()
+
+def build_delta(changes: List[Dict], current: Dict[str, Dict], title: str, link: str, desc: str,
+                max_items: int, out: TextIO) -> None:
+    """
+    "New and updated only" feed: one item per (job, fingerprint) so readers
+    surface an edited ad again, dated when the change was detected.
+    """
+    w = FeedWriter(out, validate=VALIDATE)
+    w.open(title, link, desc, as_rfc2822(dt.datetime.now(dt.UTC)))
+
+    latest: Dict[str, Dict] = {}
+    for c in changes:
+        if c.get("change") in ("new", "changed") and c.get("guid") in current:
+            latest[c["guid"]] = c
+    ordered = sorted(latest.values(), key=lambda c: c.get("detected_at") or "", reverse=True)
+    for c in ordered[:max_items]:
+        rec = current[c["guid"]]
+        if c["change"] == "changed":
+            rec = dict(rec, title=f"Updated: {rec.get('title') or '(untitled)'}")
+        detected = dt.datetime.fromisoformat(c["detected_at"].replace("Z", "+00:00"))
+        w.item("\n".join(render_item(rec, guid=f"{c['guid']}:{(c.get('fp') or '')[:12]}",
+                                      pubdate=as_rfc2822(detected))))
+    w.close()
+
+def update_delta(rows: List[Dict], args) -> Dict[str, Dict]:
+    """Diff the latest run against the previous fingerprints; write changes log and delta feed."""
+    current = feed_delta.latest_by_guid(feed_delta.latest_run(rows), item_guid)
+    fp_path = Path(args.fingerprints)
+    previous = feed_delta.load_snapshot(fp_path)
+    snapshot = feed_delta.snapshot_of(current)
+    detected_at = dt.datetime.now(dt.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+    changes = feed_delta.compute_delta(previous, snapshot, detected_at)
+
+    log = feed_delta.read_changes(Path(args.changes)) + changes
+    log = feed_delta.write_changes(Path(args.changes), log, args.delta_days)
+    feed_delta.save_snapshot(fp_path, snapshot)
+
+    if args.delta_out:
+        write_if_changed(Path(args.delta_out), lambda out: build_delta(
+            log, current, f"{args.title} (new and updated)", args.link, args.desc, args.max_items, out))
+
+    counts = {k: sum(1 for c in changes if c["change"] == k) for k in ("new", "changed", "removed")}
+    print(f"Delta: {counts['new']} new, {counts['changed']} changed, {counts['removed']} removed -> {args.changes}")
+    return current
+
+def write_partitions(rows: List[Dict], args, cache: Optional[RenderCache]) -> int:
+    """Per-council/band/engine feeds from one pass over the sorted rows, plus index.json."""
+    import feed_partitions
+    out_dir = Path(args.partitions_dir)
+    codes = feed_partitions.load_council_codes(args.councils)
+    buckets = feed_partitions.partition(sort_items(rows), codes, args.partition_max_items)
+    base_link = args.link.rsplit("/", 1)[0]
+    index = []
+    for (kind, key), b in buckets.items():
+        rel = feed_partitions.partition_path(kind, key)
+        target = out_dir / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(target, lambda out: build(b["items"], f"{args.title} — {b['label']}", f"{base_link}/{rel}",
+                                                   args.desc, args.partition_max_items, out, cache=cache))
+        index.append({"kind": kind, "key": key, "label": b["label"], "path": rel, "items": len(b["items"])})
+    feed_partitions.write_index(out_dir / "index.json", index)
+    return len(index)
+
+def build_paged(history: List[Dict], args, cache: Optional[RenderCache], out: TextIO,
+                is_live: Callable[[str, Dict], bool]) -> None:
+    """
+    RFC 5005 paged feed over the whole history: freeze the oldest pending
+    items into immutable archive pages and stream the (small) head page to out.
+    is_live(guid, record): still open and listed; pending jobs that are not
+    drop out instead of lingering on the head page.
+    """
+    archive_dir = Path(args.archive_dir)
+    base = args.link.rsplit("/", 1)[0] + "/" + archive_dir.name
+    manifest = feed_paging.load_manifest(archive_dir)
+    archived = feed_paging.archived_guids(manifest)
+
+    current = feed_delta.latest_by_guid(history, item_guid)
+    pending = sorted(
+        ((g, r) for g, r in current.items() if g not in archived and is_live(g, r)),
+        key=lambda gr: (published_at(gr[1]), gr[0]),
+    )
+    pages, head = feed_paging.plan(pending, args.head_items, args.page_items)
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    for page in pages:
+        n = len(manifest["pages"]) + 1
+        name = feed_paging.page_name(n)
+        prev = f"{base}/{feed_paging.page_name(n - 1)}" if n > 1 else ""
+        links = feed_paging.archive_links(args.link, f"{base}/{name}", prev)
+        recs = [r for _, r in page]
+        target = archive_dir / name
+        if not target.exists():
+            with target.open("w", encoding="utf-8") as f:
+                build(recs, f"{args.title} (archive {n})", args.link, args.desc, len(recs), f, cache=cache, extra=links)
+        manifest["pages"].append({"n": n, "path": name, "items": len(recs), "guids": [g for g, _ in page]})
+    if pages:
+        feed_paging.save_manifest(archive_dir, manifest)
+        print(f"Archived {sum(len(p) for p in pages)} items into {len(pages)} new page(s) in {archive_dir}")
+
+    since = feed_paging.pending_since(head)
+    if since != manifest.get("pending_since"):
+        manifest["pending_since"] = since
+        feed_paging.save_manifest(archive_dir, manifest)
+
+    n_last = len(manifest["pages"])
+    last = f"{base}/{feed_paging.page_name(n_last)}" if n_last else ""
+    recs = [r for _, r in head]
+    build(recs, args.title, args.link, args.desc, len(recs), out, cache=cache,
+          extra=feed_paging.head_links(args.link, last))
+
+def write_artifacts(rows: List[Dict], args, cache: Optional[RenderCache]) -> None:
+    """Compact RSS and JSON Feed variants of the main feed, each left as is when unchanged."""
+    if args.compact_out:
+        write_if_changed(Path(args.compact_out), lambda out: build(
+            rows, args.title, args.link, args.desc, args.max_items, out, cache=cache, compact=True))
+    if args.json_out:
+        feed_url = args.link.rsplit("/", 1)[0] + "/" + Path(args.json_out).name
+        feed = feed_artifacts.json_feed(sort_items(rows)[:args.max_items], args.title, feed_url, args.desc,
+                                        item_guid, published_at)
+        p = Path(args.json_out)
+        text = feed_artifacts.dump_json_feed(feed)
+        if not p.exists() or p.read_text(encoding="utf-8") != text:
+            p.write_text(text, encoding="utf-8")
+
+def history_days(args, today: str, snapshot_rows: bool) -> int:
+    """
+    Days of history this build must read (0 = all): the --days window,
+    unless rows come from the open-jobs snapshot. With paging, also back to
+    the head page's pending_since (see feed_paging.py); before the first
+    paged build, all of it.
+    """
+    days = 0 if snapshot_rows else args.days
+    if args.archive_dir:
+        since = feed_paging.load_manifest(Path(args.archive_dir)).get("pending_since")
+        if not since:
+            return 0
+        back = (dt.date.fromisoformat(today) - dt.date.fromisoformat(since)).days + 1
+        days = back if snapshot_rows or days <= 0 else max(days, back)
+    return days
+
+def attach_first_seen(history: List[Dict], path: Path, full_history: Path) -> None:
+    """Annotate records with their job's first_seen from the shared seen-state store."""
+    with seen_store.SeenStore(path) as store:
+        # seed from the whole file, not just the window, so first_seen is the true first sighting;
+        # only an empty store is seeded, so the full read happens once (or after a lost cache)
+        known = store.seed(read_jsonl(full_history))
+        first = store.first_seen(history)
+    for rec in history:
+        fs = first.get(item_guid(rec))
+        if fs:
+            rec["first_seen"] = fs
+    print(f"Seen state: {known} jobs known, first_seen attached to {len(first)}")
+
+def main(argv: Optional[List[str]] = None):
+    global VALIDATE
+    args = parse_args(argv)
+    VALIDATE = args.validate
+    profiler = None
+    if args.profile:
+        from profiling import RunProfiler
+        profiler = RunProfiler(Path(args.profile))
+
+    def step(name: str):
+        return profiler.section(name) if profiler else nullcontext()
+
+    with step("read"):
+        import open_jobs
+        today = open_jobs.today_local()
+        snapshot = Path(args.open_jobs) if args.open_jobs else None
+        history: List[Dict] = []
+        from_snapshot = snapshot is not None and snapshot.exists()
+        if args.archive_dir or not from_snapshot:
+            # only the tail is read: the --days window and/or what paging still has pending
+            import history_reader
+            days = history_days(args, today, snapshot_rows=from_snapshot)
+            history = history_reader.read_window(Path(args.inp), days, args.window_margin_days, args.history_index)
+        rows: Optional[List[Dict]] = None
+        if from_snapshot:
+            rows = open_jobs.load(snapshot, today)[1]   # open and listed by construction; --days does not apply
+        elif snapshot is not None:
+            rows = open_jobs.seed(snapshot, history, today)
+            print(f"Seeded open-jobs snapshot {snapshot} from {args.inp}")
+        if args.seen_db:
+            attach_first_seen(history + (rows or []), Path(args.seen_db), Path(args.inp))
+        if rows is None:
+            cutoff = dt.datetime.now(dt.UTC) - dt.timedelta(days=args.days)
+            rows = [r for r in history if within_window(r, args.days, cutoff) and open_jobs.is_open(r, today)]
+        cache = RenderCache(Path(args.render_cache)) if args.render_cache else None
+    with step("feed"):
+        if args.archive_dir:
+            # the head page shows what the snapshot lists, else what has not closed
+            listed = {item_guid(r) for r in rows} if snapshot is not None else None
+
+            def is_live(guid: str, rec: Dict) -> bool:
+                return guid in listed if listed is not None else open_jobs.is_open(rec, today)
+
+            changed = write_if_changed(Path(args.outp), lambda out: build_paged(history, args, cache, out, is_live))
+        else:
+            changed = write_if_changed(Path(args.outp), lambda out: build(
+                rows, args.title, args.link, args.desc, args.max_items, out, cache=cache))
+    if changed:
+        print(f"Wrote RSS to {args.outp}")
+    else:
+        print(f"RSS unchanged, left {args.outp} as is")
+    with step("artifacts"):
+        write_artifacts(rows, args, cache)
+    if args.partitions_dir:
+        with step("partitions"):
+            n = write_partitions(rows, args, cache)
+        print(f"Wrote {n} partitioned feeds to {args.partitions_dir}")
+    if args.search_dir:
+        import search_index
+        with step("search"):
+            today = dt.datetime.now(AUS_TZ).date().isoformat()
+            stats = search_index.update(search_index.current_jobs(rows, item_guid), Path(args.search_dir),
+                                        Path(args.search_state), today)
+        print(f"Search index: {stats['added']} added, {stats['changed']} changed, {stats['removed']} removed, "
+              f"{stats['shards']} term shards written -> {args.search_dir}")
+    if cache is not None:
+        cache.save()
+        print(f"Render cache: {cache.hits} reused, {cache.misses} rendered")
+    if args.changes:
+        with step("delta"):
+            update_delta(rows, args)
+
+    artifacts = [Path(p) for p in (args.outp, args.compact_out, args.json_out, args.delta_out) if p]
+    if args.compress:
+        # siblings follow their source's mtime, so feeds left unchanged this run still get them once
+        with step("compress"):
+            n = sum(len(feed_artifacts.write_compressed(p)) for p in artifacts if p.exists())
+        print(f"Compressed {n} sibling(s)")
+    if args.size_report:
+        report = feed_artifacts.size_report(artifacts, args.size_budget or None)
+        feed_artifacts.write_size_report(Path(args.size_report), report)
+        for name, row in report["files"].items():
+            print(f"  {name}: {row['bytes']:,} B" + "".join(f", {k} {row[k]:,} B" for k in ("gz", "br") if k in row))
+        for name in report["over_budget"]:
+            print(f"WARNING: {name} exceeds size budget of {args.size_budget:,} bytes")
+    if profiler is not None:
+        print(profiler.write())
 
 if __name__ == "__main__":
     main()
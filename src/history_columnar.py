@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+history_columnar.py
+Columnar (NumPy) export of jobs_history.jsonl with vectorised trend queries.
+
+The store is a directory of append-only chunks plus shared dictionaries:
+
+  dicts.json     {"council": [...], "band": [...], "source_engine": [...], "job": [...]}
+  meta.json      {"offset": <bytes of history already ingested>, "tail_sha1": <hash of the
+                 bytes just before offset>, "chunks": N}
+  part-00000.npz one chunk per export run
+
+Each chunk holds one row per history record, with string columns
+dictionary-encoded to integer codes, dates stored as days since 1970-01-01
+(-1 when missing) and salary as annualised float bounds (NaN when missing). Exports
+resume from the byte offset, so a run only converts the lines the scraper
+appended since the last export. When the history was rewritten in place
+(e.g. by history_compact), the bytes before the offset no longer hash to
+tail_sha1 and the store is rebuilt from scratch.
+
+Usage:
+  python src/history_columnar.py export --in data/jobs_history.jsonl --store data/columnar
+  python src/history_columnar.py open-per-council --store data/columnar --since 2025-10-01
+  python src/history_columnar.py salary-by-band --store data/columnar
+  python src/history_columnar.py time-to-close --store data/columnar
+"""
+
+import argparse
+import datetime as dt
+import hashlib
+import json
+import sys
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional analytics dependency
+    np = None
+
+from pay import Pay
+from scraper import JobRecord
+
+DICT_COLUMNS = ("council", "band", "source_engine")
+DATE_COLUMNS = ("posted_date", "closing_date")
+EPOCH = dt.date(1970, 1, 1)
+TAIL_HASH_BYTES = 4096
+
+RECORD_FIELDS = tuple(f.name for f in fields(JobRecord))
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy not installed. Add 'numpy' to requirements.txt.")
+
+# -------- Encoding --------
+
+def day_number(s: Optional[str]) -> int:
+    if not s:
+        return -1
+    try:
+        return (dt.date.fromisoformat(s[:10]) - EPOCH).days
+    except ValueError:
+        return -1
+
+def annual_bounds(rec: JobRecord) -> tuple:
+    lo, hi = Pay(rec.salary_min, rec.salary_max, rec.salary_period).annual()
+    return (float("nan"), float("nan")) if lo is None else (lo, hi)
+
+class Dictionaries:
+    def __init__(self, data: Optional[Dict[str, List[str]]] = None):
+        self.values: Dict[str, List[str]] = {c: list((data or {}).get(c) or []) for c in DICT_COLUMNS + ("job",)}
+        self.index = {c: {v: i for i, v in enumerate(vs)} for c, vs in self.values.items()}
+
+    def code(self, column: str, value: Optional[str]) -> int:
+        if value is None or value == "":
+            return -1
+        idx = self.index[column]
+        i = idx.get(value)
+        if i is None:
+            i = idx[value] = len(self.values[column])
+            self.values[column].append(value)
+        return i
+
+# -------- Store --------
+
+def _tail_hash(f, end: int) -> str:
+    start = max(0, end - TAIL_HASH_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(end - start)).hexdigest()
+
+class ColumnarStore:
+    def __init__(self, root: Path):
+        self.root = root
+        self.meta = {"offset": 0, "chunks": 0}
+        dicts = None
+        if (root / "meta.json").exists():
+            self.meta = json.loads((root / "meta.json").read_text(encoding="utf-8"))
+        if (root / "dicts.json").exists():
+            dicts = json.loads((root / "dicts.json").read_text(encoding="utf-8"))
+        self.dicts = Dictionaries(dicts)
+
+    def reset(self) -> None:
+        for p in self.root.glob("part-*.npz"):
+            p.unlink()
+        self.meta = {"offset": 0, "chunks": 0}
+        self.dicts = Dictionaries()
+
+    def append_from(self, history: Path) -> int:
+        """Encode history lines appended since the last export into a new chunk (or rebuild, if rewritten)."""
+        _require_numpy()
+        offset = self.meta.get("offset", 0)
+        if offset:
+            with history.open("rb") as f:
+                rewritten = history.stat().st_size < offset or _tail_hash(f, offset) != self.meta.get("tail_sha1")
+            if rewritten:
+                print(f"{history} was rewritten since the last export; rebuilding {self.root}", file=sys.stderr)
+                self.reset()
+                offset = 0
+        cols: Dict[str, list] = {c: [] for c in DICT_COLUMNS + DATE_COLUMNS + ("job", "scrape_day")}
+        sal_min: List[float] = []
+        sal_max: List[float] = []
+        with history.open("rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # partial trailing line; pick it up next time
+                offset += len(raw)
+                try:
+                    row = json.loads(raw)
+                    rec = JobRecord(**{k: row.get(k) for k in RECORD_FIELDS})
+                except (ValueError, AttributeError):
+                    continue
+                for c in DICT_COLUMNS:
+                    cols[c].append(self.dicts.code(c, (getattr(rec, c) or "").strip()))
+                for c in DATE_COLUMNS:
+                    cols[c].append(day_number(getattr(rec, c)))
+                cols["scrape_day"].append(day_number(rec.scrape_date))
+                cols["job"].append(self.dicts.code("job", f"{rec.council or ''}|{rec.link or ''}"))
+                lo, hi = annual_bounds(rec)
+                sal_min.append(lo)
+                sal_max.append(hi)
+            tail = _tail_hash(f, offset)
+
+        n = len(cols["job"])
+        if n:
+            self.root.mkdir(parents=True, exist_ok=True)
+            arrays = {c: np.asarray(v, dtype=np.int32) for c, v in cols.items()}
+            arrays["salary_min"] = np.asarray(sal_min, dtype=np.float64)
+            arrays["salary_max"] = np.asarray(sal_max, dtype=np.float64)
+            np.savez_compressed(self.root / f"part-{self.meta['chunks']:05d}.npz", **arrays)
+            self.meta["chunks"] += 1
+        self.meta["offset"] = offset
+        self.meta["tail_sha1"] = tail
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / "dicts.json").write_text(json.dumps(self.dicts.values, ensure_ascii=False), encoding="utf-8")
+        (self.root / "meta.json").write_text(json.dumps(self.meta), encoding="utf-8")
+        return n
+
+    def load(self) -> Dict[str, "np.ndarray"]:
+        _require_numpy()
+        parts = sorted(self.root.glob("part-*.npz"))
+        if not parts:
+            return {}
+        loaded = [np.load(p) for p in parts]
+        return {k: np.concatenate([l[k] for l in loaded]) for k in loaded[0].files}
+
+# -------- Queries --------
+
+def latest_per_job(cols: Dict[str, "np.ndarray"]) -> Dict[str, "np.ndarray"]:
+    """One row per job: first scrape day, last scrape day and the latest observation's fields."""
+    order = np.lexsort((cols["scrape_day"], cols["job"]))
+    job = cols["job"][order]
+    starts = np.flatnonzero(np.r_[True, job[1:] != job[:-1]])
+    ends = np.r_[starts[1:], len(job)] - 1
+    last = order[ends]
+    out = {k: v[last] for k, v in cols.items()}
+    out["first_seen"] = cols["scrape_day"][order[starts]]
+    out["last_seen"] = cols["scrape_day"][last]
+    return out
+
+def open_per_council(cols, since: int, until: int) -> "np.ndarray":
+    """counts[council, day] of jobs open on each day in [since, until]."""
+    jobs = latest_per_job(cols)
+    n_councils = int(cols["council"].max()) + 1 if len(cols["council"]) else 0
+    days = until - since + 1
+    opened = np.where(jobs["posted_date"] >= 0, jobs["posted_date"], jobs["first_seen"])
+    closed = np.where(jobs["closing_date"] >= 0, jobs["closing_date"], jobs["last_seen"])
+    closed = np.maximum(closed, opened)  # a closing date before the posting date counts as open that day only
+    ok = (jobs["council"] >= 0) & (closed >= since) & (opened <= until)
+    a = np.clip(opened[ok], since, until) - since
+    b = np.clip(closed[ok], since, until) - since + 1
+    c = jobs["council"][ok]
+    diff = np.zeros((n_councils, days + 1), dtype=np.int32)
+    np.add.at(diff, (c, a), 1)
+    np.add.at(diff, (c, b), -1)
+    return np.cumsum(diff[:, :days], axis=1)
+
+def salary_by_band(cols) -> Dict[int, Dict[str, float]]:
+    jobs = latest_per_job(cols)
+    ok = (jobs["band"] >= 0) & ~np.isnan(jobs["salary_min"])
+    band, lo, hi = jobs["band"][ok], jobs["salary_min"][ok], jobs["salary_max"][ok]
+    out = {}
+    for b in np.unique(band):
+        m = band == b
+        out[int(b)] = {"jobs": int(m.sum()), "min": float(lo[m].min()), "median": float(np.median(lo[m])),
+                       "max": float(hi[m].max())}
+    return out
+
+def time_to_close(cols) -> Dict[int, Dict[str, float]]:
+    """Days from posting (or first sighting) to closing date, per council."""
+    jobs = latest_per_job(cols)
+    opened = np.where(jobs["posted_date"] >= 0, jobs["posted_date"], jobs["first_seen"])
+    ok = (jobs["closing_date"] >= 0) & (jobs["council"] >= 0) & (opened >= 0)
+    span = (jobs["closing_date"] - opened)[ok]
+    council = jobs["council"][ok]
+    out = {}
+    for c in np.unique(council):
+        m = council == c
+        out[int(c)] = {"jobs": int(m.sum()), "median_days": float(np.median(span[m])), "mean_days": float(span[m].mean())}
+    return out
+
+# -------- CLI --------
+
+def main():
+    ap = argparse.ArgumentParser(description="Columnar job-history export and trend queries")
+    ap.add_argument("command", choices=["export", "open-per-council", "salary-by-band", "time-to-close"])
+    ap.add_argument("--store", default="data/columnar", help="Columnar store directory")
+    ap.add_argument("--in", dest="inp", default="data/jobs_history.jsonl", help="History JSONL (export)")
+    ap.add_argument("--since", default=None, help="First day for open-per-council (default: 30 days ago)")
+    ap.add_argument("--until", default=None, help="Last day for open-per-council (default: today)")
+    args = ap.parse_args()
+
+    store = ColumnarStore(Path(args.store))
+    if args.command == "export":
+        n = store.append_from(Path(args.inp))
+        print(f"Appended {n} records to {args.store} ({store.meta['chunks']} chunks)", file=sys.stderr)
+        return
+
+    cols = store.load()
+    if not cols:
+        raise SystemExit(f"No data in {args.store}; run export first")
+    names = store.dicts.values
+    if args.command == "open-per-council":
+        until = day_number(args.until) if args.until else (dt.date.today() - EPOCH).days
+        since = day_number(args.since) if args.since else until - 30
+        counts = open_per_council(cols, since, until)
+        out = {}
+        for ci, row in enumerate(counts):
+            out[names["council"][ci]] = {
+                (EPOCH + dt.timedelta(days=since + d)).isoformat(): int(v) for d, v in enumerate(row)
+            }
+    elif args.command == "salary-by-band":
+        out = {names["band"][b]: v for b, v in salary_by_band(cols).items()}
+    else:
+        out = {names["council"][c]: v for c, v in time_to_close(cols).items()}
+    json.dump(out, sys.stdout, ensure_ascii=False, indent=1)
+    sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+history_compact.py
+Compacts jobs_history.jsonl by dropping unchanged re-scrapes.
+
+For every job (council|link) it keeps the first sighting, every sighting whose
+fingerprint differs from the previous kept one, and the last sighting, so
+first_seen/last_seen and each council's latest run survive. Line order is
+preserved and the file is replaced atomically.
+
+Usage:
+  python src/history_compact.py --in data/jobs_history.jsonl
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from feed_delta import fingerprint
+
+def job_key(rec: Dict) -> str:
+    return f"{rec.get('council') or ''}|{rec.get('link') or ''}"
+
+def compact_file(src: Path, dst: Path) -> Dict[str, int]:
+    last_line: Dict[str, int] = {}
+    with src.open("r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            try:
+                last_line[job_key(json.loads(line))] = i
+            except ValueError:
+                continue
+
+    kept_fp: Dict[str, str] = {}
+    stats = {"read": 0, "kept": 0}
+    tmp = dst.with_name(dst.name + ".tmp")
+    with src.open("r", encoding="utf-8") as f, tmp.open("w", encoding="utf-8") as out:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            stats["read"] += 1
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            key = job_key(rec)
+            fp = fingerprint(rec)
+            if kept_fp.get(key) != fp or last_line.get(key) == i:
+                kept_fp[key] = fp
+                out.write(line if line.endswith("\n") else line + "\n")
+                stats["kept"] += 1
+    os.replace(tmp, dst)
+    return stats
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Drop unchanged re-scrapes from the job history")
+    ap.add_argument("--in", dest="inp", default="data/jobs_history.jsonl", help="History JSONL")
+    ap.add_argument("--out", dest="outp", default=None, help="Output path (default: rewrite --in)")
+    args = ap.parse_args(argv)
+    src = Path(args.inp)
+    stats = compact_file(src, Path(args.outp) if args.outp else src)
+    print(f"Kept {stats['kept']} of {stats['read']} records")
+
+if __name__ == "__main__":
+    main()
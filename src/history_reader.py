@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+history_reader.py
+Windowed reads of the append-only job history for feeds_site_builder.
+
+The history grows by one scrape run per append, so it is roughly ordered by
+scrape_date. read_window() memory-maps the file and walks it backwards from
+the end, one line per step. It takes each line's scrape day from the raw
+bytes without decoding the JSON. It stops after STOP_AFTER consecutive lines
+older than the window start, where the window start is --days plus a
+safety margin. That tolerates a few lines appended out of order. Only lines
+that are kept are decoded.
+
+With use_index=True a sidecar "<history>.idx.json" maps each scrape day to
+the byte offset where that day first appears. The window then starts with
+one seek, and the read is exact even for badly ordered files. The index is
+extended incrementally over newly appended bytes. It is rebuilt when the
+file was rewritten (e.g. by history_compact), which is detected by the
+indexed size and a hash of the bytes just before it.
+"""
+
+import datetime as dt
+import hashlib
+import json
+import mmap
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DATE_KEY = b'"scrape_date": "'
+STOP_AFTER = 50        # consecutive too-old lines before the backward scan stops
+TAIL_HASH_BYTES = 4096
+
+def _day_of(line: bytes) -> Optional[str]:
+    i = line.rfind(DATE_KEY)
+    if i < 0:
+        return None
+    return line[i + len(DATE_KEY):i + len(DATE_KEY) + 10].decode("ascii", "replace")
+
+def _decode(lines: Iterator[bytes]) -> List[Dict]:
+    out = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            out.append(json.loads(line))
+        except ValueError:
+            continue
+    return out
+
+def _lines_from(mm: mmap.mmap, pos: int, end: int) -> Iterator[Tuple[int, bytes]]:
+    while pos < end:
+        nl = mm.find(b"\n", pos, end)
+        stop = end if nl < 0 else nl + 1
+        yield pos, mm[pos:stop]
+        pos = stop
+
+# -------- Sidecar index --------
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx.json")
+
+def _tail_hash(mm: mmap.mmap, size: int) -> str:
+    return hashlib.sha1(mm[max(0, size - TAIL_HASH_BYTES):size]).hexdigest()
+
+def update_index(path: Path, mm: mmap.mmap, size: int) -> Dict[str, int]:
+    """Load the sidecar index, extend it over appended bytes (or rebuild it), save and return day -> offset."""
+    ip = index_path(path)
+    idx: Dict = {}
+    if ip.exists():
+        try:
+            idx = json.loads(ip.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            idx = {}
+    start = idx.get("size", 0)
+    if not (0 < start <= size and idx.get("tail_sha1") == _tail_hash(mm, start)):
+        idx, start = {"days": {}}, 0
+    days: Dict[str, int] = idx.get("days", {})
+    if start < size:
+        for off, line in _lines_from(mm, start, size):
+            day = _day_of(line)
+            if day and day not in days:
+                days[day] = off
+        ip.write_text(json.dumps({"size": size, "tail_sha1": _tail_hash(mm, size), "days": days},
+                                 sort_keys=True) + "\n", encoding="utf-8")
+    return days
+
+# -------- Reading --------
+
+def read_window(path: Path, days: int, margin_days: float = 2.0, use_index: bool = False,
+                now: Optional[dt.datetime] = None) -> List[Dict]:
+    """
+    History records scraped within days + margin_days, in file order.
+    days <= 0 reads everything. Callers still apply their own window filter.
+    """
+    if not path.exists():
+        return []
+    with path.open("rb") as f:
+        size = f.seek(0, 2)
+        if size == 0:
+            return []
+        if days <= 0:
+            f.seek(0)
+            return _decode(iter(f))
+        since = ((now or dt.datetime.now(dt.UTC)) - dt.timedelta(days=days + margin_days)).date().isoformat()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if use_index:
+                offsets = update_index(path, mm, size)
+                start = min((off for day, off in offsets.items() if day >= since), default=size)
+                return _decode(line for _, line in _lines_from(mm, start, size))
+
+            kept: List[bytes] = []
+            old_run = 0
+            end = size
+            while end > 0 and old_run < STOP_AFTER:
+                start = mm.rfind(b"\n", 0, end - 1) + 1
+                line = mm[start:end]
+                day = _day_of(line)
+                if day is not None and day < since:
+                    old_run += 1
+                else:
+                    old_run = 0
+                    kept.append(line)
+                end = start
+            kept.reverse()
+            return _decode(iter(kept))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+http_bytes.py
+Byte-level response handling for the scraper's HTTP layer.
+
+  - read_capped() streams a body and stops at a byte cap, so an oversized
+    landing page cannot exhaust memory or time.
+  - EncodingCache picks a body's charset without decoding it. It tries, in
+    order: the Content-Type charset, a BOM or <meta charset> in the first
+    few KB, then the host's previously detected encoding (if it still
+    decodes the body). Only when all of these fail does it run
+    charset_normalizer, and then only on a prefix of the body. Detected
+    encodings persist between runs (--encoding-cache).
+  - ByteCounters keeps per-host totals of bytes kept and bytes discarded
+    past the cap.
+
+Adapters parse resp.content (bytes) with from_encoding=resp.encoding, so
+lxml decodes the body once, natively, instead of requests decoding it to
+str and the parser working over that.
+"""
+
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_MAX_BYTES = 5_000_000
+CHUNK_BYTES = 64 * 1024
+SNIFF_BYTES = 4096           # where BOMs and <meta charset> must appear
+DETECT_BYTES = 64 * 1024     # prefix handed to charset_normalizer
+
+_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_BOMS = ((b"\xef\xbb\xbf", "utf-8"), (b"\xff\xfe", "utf-16"), (b"\xfe\xff", "utf-16"))
+
+def read_capped(resp: "requests.Response", max_bytes: int) -> int:
+    """
+    Read resp's body (content-decoded) into resp.content, keeping at most
+    max_bytes (0 = no cap). Returns the number of bytes read past the cap and
+    dropped; the connection is closed there rather than drained.
+    """
+    buf = bytearray()
+    discarded = 0
+    for chunk in resp.iter_content(CHUNK_BYTES):
+        room = max_bytes - len(buf) if max_bytes > 0 else len(chunk)
+        if len(chunk) <= room:
+            buf += chunk
+            continue
+        buf += chunk[:room]
+        discarded = len(chunk) - room
+        resp.close()
+        break
+    resp._content = bytes(buf)
+    resp._content_consumed = True
+    return discarded
+
+def declared_charset(content_type: str) -> Optional[str]:
+    m = _CHARSET_RE.search(content_type or "")
+    return m.group(1).lower() if m else None
+
+def sniff(body: bytes) -> Optional[str]:
+    """Charset stated by the body itself: a BOM or a <meta charset>/http-equiv near the top."""
+    for bom, enc in _BOMS:
+        if body.startswith(bom):
+            return enc
+    m = _META_CHARSET_RE.search(body[:SNIFF_BYTES])
+    return m.group(1).decode("ascii").lower() if m else None
+
+def detect(body: bytes) -> str:
+    from charset_normalizer import from_bytes
+    best = from_bytes(body[:DETECT_BYTES]).best()
+    # an all-ASCII page says nothing beyond "ASCII-compatible"; utf-8 covers it and its siblings
+    return best.encoding if best is not None and best.encoding != "ascii" else "utf-8"
+
+def decodes(body: bytes, encoding: str) -> bool:
+    """A cached charset is only reused while it still decodes the body's prefix cleanly."""
+    try:
+        body[:DETECT_BYTES].decode(encoding)
+    except (UnicodeDecodeError, LookupError):
+        return False
+    return True
+
+class EncodingCache:
+    """Per-host detected encodings, shared by all adapters; optionally persisted as JSON."""
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.hosts: Dict[str, str] = {}
+        self.detected = 0
+        self._lock = threading.Lock()
+        if path is not None and path.exists():
+            try:
+                self.hosts = dict(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                self.hosts = {}
+
+    def resolve(self, host: str, resp: "requests.Response") -> str:
+        content_type = resp.headers.get("Content-Type") or ""
+        enc = declared_charset(content_type)
+        if enc:
+            return enc
+        if "json" in content_type:
+            return "utf-8"
+        body = resp.content or b""
+        enc = sniff(body)
+        if enc:
+            return enc
+        with self._lock:
+            enc = self.hosts.get(host)
+        if enc and decodes(body, enc):
+            return enc
+        enc = detect(body)
+        with self._lock:
+            self.hosts[host] = enc
+            self.detected += 1
+        return enc
+
+    def save(self) -> None:
+        if self.path is None or not self.detected:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.path.write_text(json.dumps(self.hosts, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+
+class ByteCounters:
+    def __init__(self):
+        self.hosts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, host: str, kept: int, discarded: int) -> None:
+        with self._lock:
+            h = self.hosts.setdefault(host, {"responses": 0, "bytes": 0, "discarded": 0, "truncated": 0})
+            h["responses"] += 1
+            h["bytes"] += kept
+            h["discarded"] += discarded
+            h["truncated"] += 1 if discarded else 0
+
+    def summary(self, top: int = 10) -> List[str]:
+        rows = sorted(self.hosts.items(), key=lambda kv: -kv[1]["bytes"])
+        return [f"{host}: {h['bytes']:,} B in {h['responses']} responses"
+                + (f", {h['discarded']:,} B discarded from {h['truncated']} truncated" if h["truncated"] else "")
+                for host, h in rows[:top]]
+
+    def log(self, top: int = 10) -> None:
+        if not self.hosts:
+            return
+        total = sum(h["bytes"] for h in self.hosts.values())
+        logging.info("Downloaded %s B from %d hosts; largest:\n  %s", f"{total:,}", len(self.hosts),
+                     "\n  ".join(self.summary(top)))
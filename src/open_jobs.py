@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+open_jobs.py
+Snapshot of the jobs currently open, kept next to the append-only history.
+
+The history says what every run saw. The snapshot says what is open now:
+each council's records from its latest successful run, minus those whose
+closing_date has passed. The scraper (or `bandsight merge` for sharded runs)
+updates it after every run:
+  - a council that was scraped has its jobs replaced by the new listing, so
+    jobs that disappeared from the listing drop out;
+  - a council that failed keeps its previous jobs;
+  - jobs that have closed are swept out.
+The builder renders from it without reading the history.
+
+The file is JSON Lines. Its first line is a header:
+  {"open_jobs": 1, "updated": "<UTC stamp>", "councils": {council: last successful update}}
+Records follow, sorted by closing_date (jobs without one last), then
+council and link. The file stays O(open jobs) because every update()
+sweeps closed jobs out; a build reads it instead of the history. load()
+still reads every line, but jobs that closed since the last update form a
+prefix it skips without parsing.
+"""
+
+import datetime as dt
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+import feed_delta
+import seen_store
+
+FORMAT = 1
+AUS_TZ = ZoneInfo("Australia/Melbourne")
+NO_CLOSING = "9999-12-31"   # sorts jobs without a closing date after every real one
+
+def today_local() -> str:
+    """Closing dates are Victorian calendar dates; a job stays open through its closing day."""
+    return dt.datetime.now(AUS_TZ).date().isoformat()
+
+def _order(rec: Dict) -> Tuple[str, str, str]:
+    return (rec.get("closing_date") or NO_CLOSING, rec.get("council") or "", rec.get("link") or "")
+
+def is_open(rec: Dict, today: str) -> bool:
+    return (rec.get("closing_date") or NO_CLOSING) >= today
+
+def load(path: Path, today: Optional[str] = None) -> Tuple[Dict, List[Dict]]:
+    """(header, open records); records closed before today are skipped, not parsed past the prefix."""
+    today = today or today_local()
+    header: Dict = {"open_jobs": FORMAT, "updated": None, "councils": {}}
+    out: List[Dict] = []
+    if not path.exists():
+        return header, out
+    with path.open("r", encoding="utf-8") as f:
+        first = f.readline()
+        try:
+            header = json.loads(first)
+        except ValueError:
+            pass
+        for line in f:
+            if not out and line.startswith('{"closing_date": "') and line[18:28] < today:
+                continue   # expired prefix: decided from the sort key alone
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if is_open(rec, today):
+                out.append(rec)
+    return header, out
+
+def save(path: Path, header: Dict, records: Iterable[Dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write(json.dumps(header, ensure_ascii=False, sort_keys=True) + "\n")
+        for rec in sorted(records, key=_order):
+            # closing_date first so load() can skip the expired prefix without parsing it
+            row = {"closing_date": rec.get("closing_date"), **rec}
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+
+def update(path: Path, records: Iterable[Dict], scraped: Set[str], today: Optional[str] = None) -> Dict[str, int]:
+    """
+    Replace the scraped councils' jobs with this run's records (stale ones
+    ignored) and sweep closed jobs. Returns counts for the run log.
+    """
+    today = today or today_local()
+    header, current = load(path, today)
+    fresh: Dict[str, Dict] = {}
+    for r in records:
+        if r.get("stale") or r.get("council") not in scraped:
+            continue
+        g = seen_store.record_guid(r)
+        if g not in fresh or (r.get("scrape_date") or "") >= (fresh[g].get("scrape_date") or ""):
+            fresh[g] = r
+    kept = [r for r in current if r.get("council") not in scraped]
+    before = {seen_store.record_guid(r) for r in current}
+    opened = [r for r in fresh.values() if is_open(r, today)]
+    stamp = dt.datetime.now(dt.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+    councils = dict(header.get("councils") or {})
+    councils.update((c, stamp) for c in scraped)
+    header = {"open_jobs": FORMAT, "updated": stamp, "councils": councils}
+    save(path, header, kept + opened)
+    after = {seen_store.record_guid(r) for r in opened} | {seen_store.record_guid(r) for r in kept}
+    return {"open": len(after), "added": len(after - before), "dropped": len(before - after)}
+
+def seed(path: Path, history: Iterable[Dict], today: Optional[str] = None) -> List[Dict]:
+    """Build a missing snapshot from the history's latest run per council; returns its records."""
+    latest = feed_delta.latest_by_guid(feed_delta.latest_run(r for r in history if not r.get("stale")),
+                                       seen_store.record_guid)
+    update(path, latest.values(), {r.get("council") for r in latest.values()}, today)
+    return load(path, today)[1]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+pay.py
+One normaliser for free-text salary and band strings.
+
+  parse_pay("$95,760 – $104,210 per annum plus super", band_text)
+    -> Pay(salary_min=95760.0, salary_max=104210.0, period="year", band="Band 6")
+
+Bands are canonicalised to "Band N" (Victorian council EA bands 1–8). When an
+ad states no band, it is inferred from the annualised salary using a
+precomputed table of typical EA band ranges.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# Approximate annual ranges (full time, excl. super) across Victorian council
+# enterprise agreements; lower bound of each band in ascending order.
+BAND_FLOORS: Tuple[Tuple[float, int], ...] = (
+    (50_000, 1),
+    (57_000, 2),
+    (64_000, 3),
+    (71_000, 4),
+    (80_000, 5),
+    (91_000, 6),
+    (106_000, 7),
+    (124_000, 8),
+)
+BAND_CEILING = 150_000  # above this it is not a banded role (e.g. executive contracts)
+_FLOOR_VALUES = [f for f, _ in BAND_FLOORS]
+
+ANNUAL_FACTOR = {
+    "year": 1.0,
+    "fortnight": 26.09,
+    "week": 52.18,
+    "day": 260.9,
+    "hour": 38 * 52.18,
+}
+
+_BAND_RE = re.compile(r"\bband\s*([1-8])(?![0-9])\s*([a-d])?\b", re.I)
+_MONEY_RE = re.compile(r"\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+(?:\.[0-9]{1,2})?)\s*(k\b)?", re.I)
+_PERIOD_RES = (
+    ("hour", re.compile(r"(?:per|an)\s+hour|/\s*h(?:ou)?r\b|\bp/?h\b|\bhourly\b", re.I)),
+    ("day", re.compile(r"(?:per|a)\s+(?:day|shift)|per\s+diem|/\s*day\b|\bp\.d\.|\bdaily\b", re.I)),
+    ("week", re.compile(r"(?:per|a)\s+week|/\s*w(?:ee)?k\b|\bp/?w\b|\bweekly\b", re.I)),
+    ("fortnight", re.compile(r"(?:per|a)\s+fortnight|fortnightly", re.I)),
+    ("year", re.compile(r"per\s+(?:annum|year)|\bp\.?\s?a\.?\b|\bannual(?:ly)?\b|/\s*y(?:ea)?r\b", re.I)),
+)
+# when no period is stated anywhere: the largest amount's magnitude, upper bound per period
+# (award rates: hourly under $200, daily under $1,000, weekly under $2,500, fortnightly under $6,000)
+_PERIOD_BY_SIZE: Tuple[Tuple[float, str], ...] = ((200, "hour"), (1_000, "day"), (2_500, "week"), (6_000, "fortnight"))
+
+@dataclass(frozen=True)
+class Pay:
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    period: Optional[str] = None
+    band: Optional[str] = None
+
+    def annual(self) -> Tuple[Optional[float], Optional[float]]:
+        if self.salary_min is None or self.period is None:
+            return (None, None)
+        k = ANNUAL_FACTOR[self.period]
+        return (round(self.salary_min * k, 2), round((self.salary_max or self.salary_min) * k, 2))
+
+def parse_band(text: Optional[str]) -> Optional[str]:
+    """First "Band N" mention (1–8), canonicalised; sub-levels like 6A map to Band 6."""
+    if not text:
+        return None
+    m = _BAND_RE.search(text)
+    return f"Band {m.group(1)}" if m else None
+
+def band_for_salary(annual: Optional[float]) -> Optional[str]:
+    if annual is None or annual < BAND_FLOORS[0][0] or annual > BAND_CEILING:
+        return None
+    return f"Band {BAND_FLOORS[bisect_right(_FLOOR_VALUES, annual) - 1][1]}"
+
+def period_of(text: Optional[str]) -> Optional[str]:
+    """Period named in text ("per hour", "daily", "p.a." …), if any."""
+    if not text:
+        return None
+    return next((name for name, rx in _PERIOD_RES if rx.search(text)), None)
+
+def parse_amounts(text: Optional[str], context: Optional[str] = None
+                  ) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+    """
+    Amounts in text and their period: named in text, else named in context
+    (e.g. the classification line), else guessed from the amounts' size.
+    """
+    if not text:
+        return (None, None, None)
+    vals = []
+    for num, k in _MONEY_RE.findall(text):
+        v = float(num.replace(",", ""))
+        vals.append(v * 1000 if k else v)
+    if not vals:
+        return (None, None, None)
+    period = period_of(text) or period_of(context)
+    if period is None:
+        period = next((name for bound, name in _PERIOD_BY_SIZE if max(vals) < bound), "year")
+    return (min(vals), max(vals), period)
+
+def parse_pay(salary: Optional[str], band_text: Optional[str] = None) -> Pay:
+    """
+    salary: the ad's salary/remuneration string.
+    band_text: extra text searched for a band when salary names none
+    (title, classification line or page text).
+    """
+    lo, hi, period = parse_amounts(salary, band_text)
+    band = parse_band(salary) or parse_band(band_text)
+    if band is None and lo is not None:
+        band = band_for_salary(lo * ANNUAL_FACTOR[period])
+    return Pay(salary_min=lo, salary_max=hi, period=period, band=band)
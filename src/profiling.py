@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+profiling.py
+--profile support for the scraper and the feed builder.
+
+Each section of a run (a council's scrape, a builder step) is run under
+cProfile. Its stats are dumped to <dir>/<section>.pstats, which can be
+opened with `python -m pstats`, snakeviz and similar tools. profile.json
+then records, per section:
+  - wall-clock seconds,
+  - profiled time split into phases (import, fetch, parse, extract,
+    serialise, other) by the module each function lives in,
+  - the top-N functions by own time.
+The same top-N over the whole run is returned as text for the run log.
+
+cProfile only sees the thread that enabled it, so callers should run
+detail fetches serially while profiling.
+"""
+
+import cProfile
+import json
+import pstats
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# first match wins; matched against "<filename>:<function>"
+PHASES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    # first-use imports (lazy dependencies, regex compilation) would otherwise swamp "other"
+    ("import", ("<frozen importlib", "_imp.", "re/_parser", "re/_compiler", "sre_")),
+    ("fetch", ("requests", "urllib3", "socket", "ssl", "http/client", "tenacity", "idna", "charset_normalizer")),
+    ("parse", ("bs4", "lxml", "html/parser", "soupsieve", "make_soup")),
+    ("extract", ("dateutil", "re.Pattern", "/re/", "_strptime", "pay.py", "find_first", "clean_text")),
+    ("serialise", ("json", "feed_writer", "pyexpat", "gzip", "zlib", "brotli", "sqlite3")),
+)
+
+def phase_of(filename: str, func: str) -> str:
+    where = f"{filename}:{func}".replace("\\", "/")
+    for phase, needles in PHASES:
+        if any(n in where for n in needles):
+            return phase
+    return "other"
+
+def _label(key: Tuple[str, int, str]) -> str:
+    filename, line, func = key
+    if filename == "~":
+        return func
+    return f"{'/'.join(Path(filename).parts[-2:])}:{line}({func})"
+
+def breakdown(stats: pstats.Stats) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for (filename, _, func), (_, _, tottime, _, _) in stats.stats.items():
+        phase = phase_of(filename, func)
+        out[phase] = out.get(phase, 0.0) + tottime
+    return {k: round(v, 4) for k, v in sorted(out.items(), key=lambda kv: -kv[1])}
+
+def top_functions(stats: pstats.Stats, n: int) -> List[Dict]:
+    rows = sorted(stats.stats.items(), key=lambda kv: -kv[1][2])[:n]
+    return [{"function": _label(k), "calls": v[1], "tottime": round(v[2], 4), "cumtime": round(v[3], 4)}
+            for k, v in rows]
+
+def slug(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "-", name).strip("-").lower() or "section"
+
+class RunProfiler:
+    def __init__(self, out_dir: Path, top: int = 15):
+        self.out_dir = out_dir
+        self.top = top
+        self.sections: Dict[str, Dict] = {}
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Profile the block; repeated names (e.g. a council's several start URLs) accumulate."""
+        prof = cProfile.Profile()
+        t0 = time.perf_counter()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            sec = self.sections.setdefault(name, {"seconds": 0.0, "stats": None})
+            sec["seconds"] += time.perf_counter() - t0
+            if sec["stats"] is None:
+                sec["stats"] = pstats.Stats(prof)
+            else:
+                sec["stats"].add(prof)
+
+    def write(self) -> str:
+        """Dump .pstats per section plus profile.json; returns the run-wide top-N summary."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        report: Dict[str, Dict] = {}
+        combined: Optional[pstats.Stats] = None
+        for name, sec in self.sections.items():
+            st: pstats.Stats = sec["stats"]
+            st.dump_stats(str(self.out_dir / f"{slug(name)}.pstats"))
+            report[name] = {
+                "seconds": round(sec["seconds"], 3),
+                "phases": breakdown(st),
+                "top": top_functions(st, self.top),
+            }
+            if combined is None:
+                combined = pstats.Stats(str(self.out_dir / f"{slug(name)}.pstats"))
+            else:
+                combined.add(st)
+        if combined is None:
+            return "No profiled sections."
+        combined.dump_stats(str(self.out_dir / "all.pstats"))
+        summary = {"phases": breakdown(combined), "top": top_functions(combined, self.top)}
+        (self.out_dir / "profile.json").write_text(
+            json.dumps({"summary": summary, "sections": report}, indent=1) + "\n", encoding="utf-8")
+
+        slowest = sorted(report.items(), key=lambda kv: -kv[1]["seconds"])[:5]
+        lines = [f"Profile written to {self.out_dir}",
+                 "  phases: " + ", ".join(f"{k} {v:.2f}s" for k, v in summary["phases"].items()),
+                 "  slowest sections: " + ", ".join(f"{k} {v['seconds']:.2f}s" for k, v in slowest),
+                 f"  top {self.top} functions by own time:"]
+        lines += [f"    {r['tottime']:8.3f}s {r['calls']:>9} calls  {r['function']}" for r in summary["top"]]
+        return "\n".join(lines)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+registry.py
+Council registry loading, validation and adapter routing.
+
+The YAML registry is parsed with PyYAML's C loader when available and the
+validated result is cached as JSON under .cache/ next to the registry, keyed
+by the registry's sha1 and CACHE_FORMAT, so unchanged registries load without
+YAML at all.
+
+Registry schema (version 1):
+  councils:
+    - name: City of Ballarat        # required
+      lga_code: 201                 # optional int
+      vendor: pulse                 # optional; see ADAPTERS
+      active: true                  # default true
+      starts: [https://…]           # required, http(s) URLs
+      tuning:                       # optional per-source tuning
+        rate_limit: 0.5             # min seconds between requests to this source
+        concurrency: 4              # parallel detail-page fetches
+        timeout: 15                 # read timeout (seconds)
+        selectors: {link: "…", title: "…", description: "…"}
+        discovery: auto             # generic sources: auto (robots.txt/sitemap.xml), off, or a sitemap/feed URL
+
+Adapters register themselves with @register_adapter(vendor, hosts=…); routing
+prefers the registry's vendor, then host-suffix matching, then "generic". A
+vendor no adapter registered is an error (RegistryError), not a silent fallback.
+Installed packages can ship more adapters under the "bandsight.adapters"
+entry-point group; they are imported (and so registered) on first route().
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+TUNING_KEYS = {"rate_limit", "concurrency", "timeout", "selectors", "discovery"}
+COUNCIL_KEYS = {"name", "lga_code", "vendor", "active", "starts", "tuning"}
+# version of validate()'s output in the compiled cache; bump whenever validate() changes
+CACHE_FORMAT = 2
+
+class RegistryError(ValueError):
+    pass
+
+@dataclass
+class Tuning:
+    rate_limit: float = 0.0
+    concurrency: int = 1
+    timeout: Optional[float] = None
+    selectors: Dict[str, str] = field(default_factory=dict)
+    discovery: str = "auto"
+
+@dataclass
+class Source:
+    council: str
+    url: str
+    vendor: Optional[str] = None
+    lga_code: Optional[int] = None
+    tuning: Tuning = field(default_factory=Tuning)
+
+# -------- Adapter registry --------
+
+ADAPTERS: Dict[str, type] = {}
+HOST_SUFFIXES: Dict[str, str] = {}
+HOST_KEYWORDS: List[Tuple[str, str]] = []
+DEFAULT_VENDOR = "generic"
+PLUGIN_GROUP = "bandsight.adapters"
+_plugins_loaded = False
+
+def register_adapter(*vendors: str, hosts: Tuple[str, ...] = (), keywords: Tuple[str, ...] = ()) -> Callable:
+    """
+    Class decorator. vendors: registry `vendor:` names (first is canonical);
+    hosts: host suffixes (exact host or any subdomain); keywords: host
+    substrings for platforms without a stable domain.
+    """
+    def deco(cls):
+        for v in vendors:
+            ADAPTERS[v] = cls
+        for h in hosts:
+            HOST_SUFFIXES[h.lower()] = vendors[0]
+        for k in keywords:
+            HOST_KEYWORDS.append((k.lower(), vendors[0]))
+        return cls
+    return deco
+
+def vendor_for_host(host: str) -> Optional[str]:
+    labels = host.lower().split(".")
+    for i in range(len(labels) - 1):
+        v = HOST_SUFFIXES.get(".".join(labels[i:]))
+        if v:
+            return v
+    for k, v in HOST_KEYWORDS:
+        if k in host:
+            return v
+    return None
+
+def load_plugins() -> List[str]:
+    """
+    Import every PLUGIN_GROUP entry point once. An entry point names a module
+    or class using @register_adapter, so loading it is enough to register it.
+    """
+    global _plugins_loaded
+    if _plugins_loaded:
+        return []
+    _plugins_loaded = True
+    from importlib.metadata import entry_points
+    loaded = []
+    for ep in entry_points(group=PLUGIN_GROUP):
+        try:
+            ep.load()
+        except Exception:
+            logging.exception("Adapter plugin %s (%s) failed to load", ep.name, ep.value)
+            continue
+        loaded.append(ep.name)
+    if loaded:
+        logging.info("Loaded adapter plugins: %s", ", ".join(loaded))
+    return loaded
+
+def route(url: str, vendor: Optional[str] = None) -> type:
+    load_plugins()
+    if vendor and vendor not in ADAPTERS:
+        raise RegistryError(f"unknown vendor {vendor!r} for {url} (known: {', '.join(sorted(ADAPTERS))})")
+    if vendor and vendor != DEFAULT_VENDOR:
+        return ADAPTERS[vendor]
+    v = vendor_for_host(urlsplit(url).hostname or "")
+    return ADAPTERS[v or DEFAULT_VENDOR]
+
+# -------- Loading --------
+
+def _parse_text(p: Path, text: str) -> Any:
+    if p.suffix.lower() not in {".yaml", ".yml"}:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+    try:
+        import yaml
+    except Exception as e:
+        raise RuntimeError("PyYAML not installed. Add 'PyYAML' to requirements.txt.") from e
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(text, Loader=loader)
+
+def _is_url(u: Any) -> bool:
+    if not isinstance(u, str):
+        return False
+    parts = urlsplit(u.strip())
+    return parts.scheme in ("http", "https") and bool(parts.netloc)
+
+def validate(data: Any, path: str) -> List[Dict]:
+    """Normalise either schema to a list of council dicts, collecting every problem."""
+    errors: List[str] = []
+    out: List[Dict] = []
+    if isinstance(data, dict) and "councils" in data:
+        rows = data.get("councils") or []
+    elif isinstance(data, list):  # legacy JSON: [ {name, url} ]
+        rows = [{"name": r.get("name"), "starts": [r.get("url")]} if isinstance(r, dict) else r for r in data]
+    else:
+        raise RegistryError(f"Unrecognised registry schema in {path}")
+
+    for i, row in enumerate(rows):
+        if not row:
+            continue
+        where = f"{path}: councils[{i}]"
+        if not isinstance(row, dict):
+            errors.append(f"{where}: expected a mapping")
+            continue
+        name = (row.get("name") or "").strip() if isinstance(row.get("name"), str) else ""
+        if not name:
+            errors.append(f"{where}: missing name")
+        where = f"{path}: {name or f'councils[{i}]'}"
+        unknown = set(row) - COUNCIL_KEYS
+        if unknown:
+            errors.append(f"{where}: unknown keys {sorted(unknown)}")
+        starts = row.get("starts") or []
+        if not isinstance(starts, list):
+            errors.append(f"{where}: starts must be a list")
+            starts = []
+        bad = [u for u in starts if not _is_url(u)]
+        if bad:
+            errors.append(f"{where}: invalid start URLs {bad}")
+        if row.get("lga_code") is not None and not isinstance(row["lga_code"], int):
+            errors.append(f"{where}: lga_code must be an integer")
+        if not isinstance(row.get("active", True), bool):
+            errors.append(f"{where}: active must be true/false")
+        tuning = row.get("tuning") or {}
+        if not isinstance(tuning, dict) or set(tuning) - TUNING_KEYS:
+            errors.append(f"{where}: tuning accepts only {sorted(TUNING_KEYS)}")
+            tuning = {}
+        disc = tuning.get("discovery")
+        if disc is False:
+            tuning["discovery"] = "off"   # YAML 1.1 reads a bare `off` as false
+        elif disc is not None and disc not in ("auto", "off") and not _is_url(disc):
+            errors.append(f"{where}: tuning.discovery must be auto, off or a URL")
+        out.append({
+            "name": name,
+            "lga_code": row.get("lga_code"),
+            "vendor": (row.get("vendor") or "").strip().lower() or None,
+            "active": row.get("active", True),
+            "starts": [u.strip() for u in starts if _is_url(u)],
+            "tuning": tuning,
+        })
+    if errors:
+        raise RegistryError("Invalid council registry:\n  " + "\n  ".join(errors))
+    return out
+
+def load_councils(path: str) -> List[Dict]:
+    """Validated council entries (including inactive ones), via the compiled JSON cache."""
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Registry not found: {path}")
+    raw = p.read_bytes()
+    digest = hashlib.sha1(raw).hexdigest()
+    cache = p.parent / ".cache" / (p.name + ".json")
+    try:
+        cached = json.loads(cache.read_text(encoding="utf-8"))
+        if cached.get("sha1") == digest and cached.get("format") == CACHE_FORMAT:
+            return cached["councils"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    councils = validate(_parse_text(p, raw.decode("utf-8")), path)
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        cache.write_text(json.dumps({"sha1": digest, "format": CACHE_FORMAT, "councils": councils}, ensure_ascii=False), encoding="utf-8")
+    except OSError:
+        pass  # read-only checkout; the cache is only an optimisation
+    return councils
+
+def tuning_of(d: Dict) -> Tuning:
+    return Tuning(
+        rate_limit=float(d.get("rate_limit") or 0.0),
+        concurrency=max(1, int(d.get("concurrency") or 1)),
+        timeout=float(d["timeout"]) if d.get("timeout") else None,
+        selectors=dict(d.get("selectors") or {}),
+        discovery=str(d.get("discovery") or "auto"),
+    )
+
+def load_sources(path: str) -> List[Source]:
+    out: List[Source] = []
+    for c in load_councils(path):
+        if not c["name"] or not c["active"]:
+            continue
+        t = tuning_of(c["tuning"])
+        for u in c["starts"]:
+            out.append(Source(c["name"], u, c["vendor"], c["lga_code"], t))
+    return out
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+resilience.py
+Failure isolation for scrape runs: per-council wall-clock deadlines, a per-host
+circuit breaker and reuse of a council's last good snapshot from history.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import feed_delta
+
+class DeadlineExceeded(Exception):
+    pass
+
+class CircuitOpen(Exception):
+    pass
+
+class Deadline:
+    """Wall-clock budget for one council; checked before every request attempt, retries included."""
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    def check(self) -> None:
+        if time.monotonic() >= self.expires:
+            raise DeadlineExceeded(f"council deadline of {self.seconds:.0f}s exceeded")
+
+class CircuitBreaker:
+    """
+    Stops requests to a host after `threshold` consecutive failures for the
+    rest of the run. Any success resets the host's count.
+    """
+    def __init__(self, threshold: int = 5):
+        self.threshold = threshold
+        self.failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def check(self, host: str) -> None:
+        if self.threshold > 0 and self.failures.get(host, 0) >= self.threshold:
+            raise CircuitOpen(f"circuit open for {host} after {self.failures[host]} consecutive failures")
+
+    def success(self, host: str) -> None:
+        with self._lock:
+            self.failures.pop(host, None)
+
+    def failure(self, host: str) -> None:
+        with self._lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+
+    def open_hosts(self) -> List[str]:
+        return sorted(h for h, n in self.failures.items() if self.threshold > 0 and n >= self.threshold)
+
+def last_good_snapshot(records: Iterable[Dict], councils: Set[str]) -> Dict[str, List[Dict]]:
+    """Each council's most recent scrape run in the history, for the given councils only."""
+    mine = [r for r in records if (r.get("council") or "") in councils]
+    out: Dict[str, List[Dict]] = {}
+    for r in feed_delta.latest_run(mine):
+        out.setdefault(r["council"], []).append(r)
+    return out
+
+def capped_timeout(timeout, deadline: Optional[Deadline]):
+    """Shrink a requests (connect, read) timeout so one request cannot outlive the deadline."""
+    if deadline is None:
+        return timeout
+    left = max(1.0, deadline.remaining())
+    if isinstance(timeout, tuple):
+        return (min(timeout[0], left), min(timeout[1], left))
+    return min(timeout, left)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scheduler.py
+Decides which councils to scrape this run.
+
+Cadence is learned from the job history: a council's posting rate is the
+number of jobs first seen in the last LOOKBACK_DAYS. Busy councils are due
+every run, quieter ones daily or weekly. A council is always due when one of
+its open jobs closes within CLOSING_SOON_DAYS (so closures are noticed) or
+when it has never been scraped. Due councils are then taken in priority
+order until the per-run request budget is spent; the rest wait for a later
+run.
+
+State (data/schedule.json): {"<council>": {"last_run": "<iso utc>"}}
+"""
+
+import datetime as dt
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from registry import Source
+
+LOOKBACK_DAYS = 60
+CLOSING_SOON_DAYS = 2
+# (min new jobs per week, scrape interval)
+CADENCE = (
+    (7.0, dt.timedelta(0)),          # daily poster or busier: every run
+    (1.0, dt.timedelta(hours=23)),   # weekly poster: once a day
+    (0.0, dt.timedelta(days=6, hours=23)),  # quiet: once a week
+)
+
+@dataclass
+class CouncilStats:
+    new_per_week: float = 0.0
+    open_jobs: int = 0
+    closing_soon: bool = False
+
+# -------- Learning from history --------
+
+def read_history(path: Path) -> Iterable[Dict]:
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def _utc(s: Optional[str]) -> Optional[dt.datetime]:
+    if not s:
+        return None
+    try:
+        d = dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return d if d.tzinfo else d.replace(tzinfo=dt.UTC)
+
+def council_stats(records: Iterable[Dict], now: Optional[dt.datetime] = None) -> Dict[str, CouncilStats]:
+    now = now or dt.datetime.now(dt.UTC)
+    first_seen: Dict[tuple, dt.datetime] = {}
+    latest: Dict[tuple, Dict] = {}
+    newest_run: Dict[str, dt.datetime] = {}
+    for rec in records:
+        council = rec.get("council") or ""
+        key = (council, rec.get("link") or "")
+        seen = _utc(rec.get("scrape_date"))
+        if seen is None:
+            continue
+        if key not in first_seen or seen < first_seen[key]:
+            first_seen[key] = seen
+        if key not in latest or seen >= _utc(latest[key]["scrape_date"]):
+            latest[key] = rec
+        if council not in newest_run or seen > newest_run[council]:
+            newest_run[council] = seen
+
+    stats: Dict[str, CouncilStats] = {}
+    since = now - dt.timedelta(days=LOOKBACK_DAYS)
+    today = now.date()
+    for (council, _), seen in first_seen.items():
+        st = stats.setdefault(council, CouncilStats())
+        if seen >= since:
+            st.new_per_week += 7.0 / LOOKBACK_DAYS
+    for (council, _), rec in latest.items():
+        # only jobs listed in the council's most recent run are still open
+        if _utc(rec["scrape_date"]) < newest_run[council] - dt.timedelta(hours=2):
+            continue
+        st = stats.setdefault(council, CouncilStats())
+        st.open_jobs += 1
+        try:
+            closes = dt.date.fromisoformat(rec.get("closing_date") or "")
+        except ValueError:
+            continue
+        if today <= closes <= today + dt.timedelta(days=CLOSING_SOON_DAYS):
+            st.closing_soon = True
+    return stats
+
+def interval_for(st: CouncilStats) -> dt.timedelta:
+    for floor, interval in CADENCE:
+        if st.new_per_week >= floor:
+            return interval
+    return CADENCE[-1][1]
+
+# -------- Planning --------
+
+def load_state(path: Path) -> Dict[str, Dict]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def save_state(path: Path, state: Dict[str, Dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+
+def plan(sources: List[Source], stats: Dict[str, CouncilStats], state: Dict[str, Dict],
+         request_budget: int = 0, now: Optional[dt.datetime] = None) -> List[Source]:
+    """
+    Sources to scrape this run, keeping each council's start URLs together.
+    A council's request cost is estimated as one listing fetch per start URL
+    plus one detail fetch per open job. request_budget <= 0 means unlimited.
+    """
+    now = now or dt.datetime.now(dt.UTC)
+    by_council: Dict[str, List[Source]] = {}
+    for s in sources:
+        by_council.setdefault(s.council, []).append(s)
+
+    due = []
+    for council, srcs in by_council.items():
+        st = stats.get(council, CouncilStats())
+        last = _utc((state.get(council) or {}).get("last_run"))
+        interval = interval_for(st)
+        if last is None or st.closing_soon:
+            urgency = float("inf")
+        elif interval.total_seconds() == 0:
+            urgency = 1e9
+        else:
+            urgency = (now - last) / interval
+        if urgency < 1.0:
+            continue
+        cost = len(srcs) + st.open_jobs
+        due.append((urgency, st.new_per_week, council, cost))
+    due.sort(key=lambda d: (-d[0], -d[1], d[2]))
+
+    picked: List[Source] = []
+    spent = 0
+    for urgency, _, council, cost in due:
+        if request_budget > 0 and spent + cost > request_budget and picked:
+            logging.info("Schedule: deferring %s (~%d requests) to stay within budget", council, cost)
+            continue
+        spent += cost
+        picked.extend(by_council[council])
+    n_picked = len({s.council for s in picked})
+    logging.info("Schedule: scraping %d of %d councils (~%d requests)", n_picked, len(by_council), spent)
+    return picked
+
+def mark_scraped(state: Dict[str, Dict], councils: Iterable[str], now: Optional[dt.datetime] = None) -> None:
+    stamp = (now or dt.datetime.now(dt.UTC)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    for c in councils:
+        state.setdefault(c, {})["last_run"] = stamp
@@ -25,31 +25,48 @@ Schema:
   "location": "Civic Centre, WERRIBEE",
   "description_html": "<p>…</p>",
   "scrape_date": "2025-10-30T14:05:00+11:00",
-  "source_engine": "pageup|pulse_rcm|scout|applynow|recruitmenthub|generic"
+  "source_engine": "pageup|pulse_rcm|scout|applynow|recruitmenthub|dayforce|generic",
+  "salary_min": 95760.0,
+  "salary_max": 95760.0,
+  "salary_period": "year|hour|day|week|fortnight",
+  "stale": false,
+  "fetched_at": null
 }
 """
 
 import argparse
 import datetime as dt
+import os
 import json
 import logging
 import re
 import sys
+import threading
 import time
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
+from zoneinfo import ZoneInfo
 
-import requests
-from bs4 import BeautifulSoup
-from dateutil import tz
-from dateutil.parser import parse as dateparse
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from registry import Source, Tuning, load_sources, register_adapter, route
+from resilience import (CircuitBreaker, CircuitOpen, Deadline, DeadlineExceeded, capped_timeout,
+                        last_good_snapshot)
+
+# requests, bs4, dateutil and tenacity are imported on first use so that
+# importing this module (registry listing, feed building, dry runs) stays fast.
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
+    from canonical import JobIndex
+    from capture import CaptureWriter, Replay
+    from http_bytes import ByteCounters, EncodingCache
 
 # -------- Config --------
 
-AUS_TZ = tz.gettz("Australia/Melbourne")
+AUS_TZ = ZoneInfo("Australia/Melbourne")
 HEADERS = {
     "User-Agent": "BandsightScraper/1.0 (+https://github.com/bandsight) requests/2.x",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,application/json;q=0.8,*/*;q=0.7",
@@ -72,11 +89,38 @@ class JobRecord:
     description_html: Optional[str]
     scrape_date: str
     source_engine: str
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    salary_period: Optional[str] = None
+    stale: bool = False  # replayed from the last good run because this run's scrape failed
+    fetched_at: Optional[str] = None  # when the detail page was last fetched, if reused (--reuse-days, sitemap lastmod)
+
+    def __post_init__(self):
+        # structured pay so consumers can filter/sort without re-parsing salary text
+        if self.salary_min is None and (self.salary or self.band):
+            from pay import parse_pay
+            p = parse_pay(self.salary, self.band)
+            # keep a stated band as written ("Grade 3", "Band 6A"); only infer one when missing
+            self.band = self.band or p.band
+            self.salary_min, self.salary_max, self.salary_period = p.salary_min, p.salary_max, p.period
 
 # -------- Utilities --------
 
+def record_from(d: Dict, **overrides) -> JobRecord:
+    """JobRecord from a history/JSON dict, ignoring unknown keys."""
+    fields = JobRecord.__dataclass_fields__
+    return JobRecord(**{k: v for k, v in {**d, **overrides}.items() if k in fields})
+
+# set while replaying a capture, so records are dated as of the captured run
+SCRAPE_TIME: Optional[str] = None
+
 def now_iso() -> str:
-    return dt.datetime.now(tz=AUS_TZ).isoformat(timespec="seconds")
+    return SCRAPE_TIME or dt.datetime.now(tz=AUS_TZ).isoformat(timespec="seconds")
+
+def band_of(text: Optional[str]) -> Optional[str]:
+    """First "Band N" in text (see pay.py, imported on first use)."""
+    from pay import parse_band
+    return parse_band(text)
 
 def clean_text(x: Optional[str]) -> Optional[str]:
     if not x:
@@ -88,6 +132,7 @@ def to_date_iso(s: Optional[str]) -> Optional[str]:
     if not s:
         return None
     s = s.strip()
+    from dateutil.parser import parse as dateparse
     try:
         d = dateparse(s, dayfirst=True, fuzzy=True)
         return d.date().isoformat()
@@ -101,37 +146,219 @@ def find_first(patterns: Iterable[str], text: str) -> Optional[str]:
             return clean_text(m.group(1) if m.groups() else m.group(0))
     return None
 
-def html_of(node: Optional[BeautifulSoup]) -> Optional[str]:
+def html_of(node: Optional["BeautifulSoup"]) -> Optional[str]:
     if not node:
         return None
     return str(node)
 
-@retry(
-    reraise=True,
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=1, max=6),
-    retry=retry_if_exception_type((requests.RequestException,))
-)
-def get(url: str, **kw) -> requests.Response:
-    kw.setdefault("headers", HEADERS)
-    kw.setdefault("timeout", (10, 20))
-    resp = requests.get(url, **kw)
-    resp.raise_for_status()
-    return resp
+def next_page_url(soup: "BeautifulSoup", base_url: str) -> Optional[str]:
+    """Listing pagination: rel=next, then a "Next"-style anchor, then the anchor after the current pager item."""
+    a = soup.select_one("a[rel~='next'][href]")
+    if a is None:
+        a = next((x for x in soup.select("a[href]")
+                  if x.get_text(" ", strip=True).lower() in {"next", "next page", "older", "more jobs", "»", "›"}),
+                 None)
+    if a is None:
+        current = soup.select_one(".pagination .active, .pagination .current, .pager .current, .pages .current")
+        a = current.find_next("a", href=True) if current else None
+    return urljoin(base_url, a["href"]) if a is not None else None
+
+def make_soup(markup: "str | bytes", parser: str = "lxml", from_encoding: Optional[str] = None) -> "BeautifulSoup":
+    """Bytes are decoded by the parser itself, as from_encoding when given."""
+    from bs4 import BeautifulSoup
+    if isinstance(markup, bytes):
+        return BeautifulSoup(markup, parser, from_encoding=from_encoding)
+    return BeautifulSoup(markup, parser)
+
+# responses are streamed and truncated past this many bytes (0 = no cap; --max-bytes)
+MAX_RESPONSE_BYTES: Optional[int] = None
+# per-host charsets, persisted with --encoding-cache; bytes kept/discarded per host.
+# All three are set up on first use (see _init_bytes) unless main() sets them first.
+ENCODINGS: Optional["EncodingCache"] = None
+BYTES: Optional["ByteCounters"] = None
+
+_retrying_get: Optional[Callable[..., "requests.Response"]] = None
+_init_lock = threading.Lock()
+
+def _init_bytes() -> None:
+    global MAX_RESPONSE_BYTES, ENCODINGS, BYTES
+    import http_bytes
+    with _init_lock:
+        if MAX_RESPONSE_BYTES is None:
+            MAX_RESPONSE_BYTES = http_bytes.DEFAULT_MAX_BYTES
+        if ENCODINGS is None:
+            ENCODINGS = http_bytes.EncodingCache()
+        if BYTES is None:
+            BYTES = http_bytes.ByteCounters()
+
+def _build_get() -> Callable[..., "requests.Response"]:
+    import requests
+    from http_bytes import read_capped
+    from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
+
+    def transient(e: BaseException) -> bool:
+        # a 404 (e.g. a sitemap probe) will not go away on retry; 429 and 5xx may
+        status = getattr(getattr(e, "response", None), "status_code", None)
+        return isinstance(e, requests.RequestException) and not (status and 400 <= status < 500 and status != 429)
+
+    backoff = wait_exponential(multiplier=1, min=1, max=6)
+
+    def wait(state) -> float:
+        # never sleep past the council's deadline; the next attempt then fails its check
+        deadline: Optional[Deadline] = state.kwargs.get("deadline")
+        return backoff(state) if deadline is None else min(backoff(state), deadline.remaining())
+
+    @retry(
+        reraise=True,
+        stop=stop_after_attempt(3),
+        wait=wait,
+        retry=retry_if_exception(transient)
+    )
+    def _get(url: str, method: str = "GET", deadline: Optional[Deadline] = None, **kw) -> "requests.Response":
+        """deadline: checked before every attempt, and each attempt's timeout is capped by it."""
+        kw.setdefault("headers", HEADERS)
+        kw.setdefault("timeout", (10, 20))
+        if deadline is not None:
+            deadline.check()
+            kw["timeout"] = capped_timeout(kw["timeout"], deadline)
+        resp = requests.request(method, url, stream=True, **kw)
+        try:
+            resp.raise_for_status()
+        except requests.HTTPError:
+            resp.close()   # unread streamed body: hand the connection back before retrying or re-raising
+            raise
+        discarded = read_capped(resp, MAX_RESPONSE_BYTES)
+        BYTES.add(urlparse(url).hostname or "", len(resp.content), discarded)
+        if discarded:
+            logging.warning("Truncated %s at %d bytes", url, MAX_RESPONSE_BYTES)
+        return resp
+    return _get
+
+def get(url: str, **kw) -> "requests.Response":
+    global _retrying_get
+    if _retrying_get is None:
+        _init_bytes()
+        _retrying_get = _build_get()
+    return _retrying_get(url, **kw)
 
 # -------- Base adapter --------
 
 class BaseAdapter:
     engine_name = "generic"
-    def __init__(self, council_name: str, start_url: str):
+    def __init__(self, council_name: str, start_url: str, tuning: Optional[Tuning] = None):
         self.council_name = council_name
         self.start_url = start_url
+        self.tuning = tuning or Tuning()
+        self._lock = threading.Lock()
+        self._last_request = 0.0
+        # set by scrape_all; both optional so adapters still work standalone
+        self.deadline: Optional[Deadline] = None
+        self.breaker: Optional[CircuitBreaker] = None
+        self.index: Optional["JobIndex"] = None
+        self.capture: Optional["CaptureWriter"] = None
+        self.replay: Optional["Replay"] = None
 
     def fetch(self) -> List[JobRecord]:
         raise NotImplementedError
 
+    def get(self, url: str, **kw) -> "requests.Response":
+        """
+        get() honouring this source's rate_limit and timeout tuning, deadline and circuit breaker.
+        JSON APIs can pass method="POST", json=…; captures then key the response by its body too.
+        resp.encoding is resolved from the headers, the body's prologue or the host's cached
+        charset (see http_bytes.py), so resp.text never runs detection over a whole body.
+        """
+        key = None
+        if self.replay is not None or self.capture is not None:
+            from capture import request_key
+            key = request_key(url, kw.get("method", "GET"), kw.get("json"))
+        host = urlparse(url).hostname or ""
+        if self.replay is not None:
+            resp = self.replay.get(key)
+            if ENCODINGS is None:
+                _init_bytes()
+            resp.encoding = ENCODINGS.resolve(host, resp)
+            return resp
+        if self.deadline is not None:
+            self.deadline.check()
+            kw["deadline"] = self.deadline
+        if self.breaker is not None:
+            self.breaker.check(host)
+        if self.tuning.rate_limit > 0:
+            with self._lock:
+                wait = self._last_request + self.tuning.rate_limit - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                self._last_request = time.monotonic()
+        if self.tuning.timeout:
+            kw.setdefault("timeout", (10, self.tuning.timeout))
+        try:
+            resp = get(url, **kw)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            # a 404 on one detail page says nothing about the host's health
+            if self.breaker is not None and (status is None or status >= 500):
+                self.breaker.failure(host)
+            raise
+        if self.breaker is not None:
+            self.breaker.success(host)
+        resp.encoding = ENCODINGS.resolve(host, resp)
+        if self.capture is not None:
+            self.capture.record(key, self.council_name, resp)
+        return resp
+
+    def soup(self, resp: "requests.Response", parser: str = "lxml") -> "BeautifulSoup":
+        """Parse a response from its bytes, in the encoding get() resolved."""
+        return make_soup(resp.content, parser, resp.encoding)
+
+    def plan_details(self, links: List[str],
+                     lastmod: Optional[Dict[str, dt.datetime]] = None) -> "tuple[List[str], List[JobRecord]]":
+        """
+        Split detail links into those to fetch and records reused from history.
+        Links are deduplicated by canonical job ID, within this listing and
+        (through the shared index) across the run. lastmod: per-link
+        modification times from a sitemap or feed (see discovery.py).
+        """
+        if self.index is None:
+            import canonical
+            return canonical.unique(links), []
+        fetch, reused = [], []
+        for href in self.index.claim(links, self.council_name):
+            rec = self.index.recent(href, self.council_name)
+            if rec is None and lastmod:
+                rec = self.index.unchanged(href, self.council_name, lastmod.get(href))
+            if rec is None:
+                fetch.append(href)
+            else:
+                reused.append(record_from(rec, scrape_date=now_iso(),
+                                          fetched_at=rec.get("fetched_at") or rec.get("scrape_date")))
+        return fetch, reused
+
+    def map_details(self, parse, links: List[str]) -> List[JobRecord]:
+        """Parse detail links, tuning.concurrency at a time; failures are logged and skipped."""
+        links, reused = self.plan_details(links)
+
+        def one(href: str) -> Optional[JobRecord]:
+            try:
+                return parse(href)
+            except (DeadlineExceeded, CircuitOpen):
+                raise
+            except Exception:
+                logging.exception("%s parse failed: %s", self.engine_name, href)
+                return None
+
+        if self.tuning.concurrency > 1 and len(links) > 1:
+            with ThreadPoolExecutor(max_workers=self.tuning.concurrency) as ex:
+                results = list(ex.map(one, links))
+        else:
+            results = [one(h) for h in links]
+        return reused + [r for r in results if r]
+
 # -------- Pulse Software (RCM) --------
 
+@register_adapter("pulse", "pulse_rcm", hosts=("pulsesoftware.com",))
 class PulseRCMAdapter(BaseAdapter):
     engine_name = "pulse_rcm"
 
@@ -143,7 +370,7 @@ class PulseRCMAdapter(BaseAdapter):
             root = base.split("/Pulse")[0] if "/Pulse" in base else base
             ws = urljoin(root + "/", "WebServices/")
         jobs_url = urljoin(ws, "RCM/Jobs/Jobs?internalOnly=public")
-        r = get(jobs_url)
+        r = self.get(jobs_url)
         data = r.json()
         jobs = data.get("Jobs") or []
         out: List[JobRecord] = []
@@ -154,19 +381,24 @@ class PulseRCMAdapter(BaseAdapter):
             slug = re.sub(r"[^\w\-]+", "-", (title or "").lower()).strip("-")
             details_link = urljoin(base.split("/Pulse")[0] + "/", f"Pulse/job/{link_id}/{slug}?source=public")
 
-            desc_html = None
+            # the listing API has every field but the description; reuse a fresh one from history
+            known = self.index.recent(details_link, self.council_name) if self.index else None
+            desc_html = known.get("description_html") if known else None
             try:
-                dr = get(details_link)
-                dsoup = BeautifulSoup(dr.text, "html.parser")
-                main = dsoup.select_one(".pulse-container") or dsoup.select_one("#main-content") or dsoup
-                desc_html = html_of(main)
+                if known is None:
+                    dr = self.get(details_link)
+                    dsoup = self.soup(dr, "html.parser")
+                    main = dsoup.select_one(".pulse-container") or dsoup.select_one("#main-content") or dsoup
+                    desc_html = html_of(main)
+            except (DeadlineExceeded, CircuitOpen):
+                raise
             except Exception:
                 logging.exception("Pulse details fetch failed for %s", details_link)
 
             posted = clean_text(info.get("PostedDate") or j.get("PostedDate"))
             close = clean_text(info.get("ClosingDate"))
             salary = clean_text(info.get("Compensation"))
-            band = find_first([r"(?i)\bBand\s*\d+\w?\b"], " ".join([title or "", salary or "", desc_html or ""]))
+            band = band_of(" ".join([title or "", salary or "", desc_html or ""]))
             employment_type = clean_text(info.get("EmploymentType"))
             work_arrangement = clean_text(info.get("WorkArrangement"))
             location = clean_text(info.get("Location"))
@@ -184,12 +416,14 @@ class PulseRCMAdapter(BaseAdapter):
                 location=location,
                 description_html=desc_html,
                 scrape_date=now_iso(),
-                source_engine=self.engine_name
+                source_engine=self.engine_name,
+                fetched_at=(known.get("fetched_at") or known.get("scrape_date")) if known else None,
             ))
         return out
 
 # -------- PageUp People --------
 
+@register_adapter("pageup", hosts=("careers.pageuppeople.com",))
 class PageUpAdapter(BaseAdapter):
     engine_name = "pageup"
 
@@ -201,33 +435,22 @@ class PageUpAdapter(BaseAdapter):
             prefix = re.sub(r"/en/.*", "/en/listing/", path)
             listing_url = f"{parts.scheme}://{parts.netloc}{prefix}"
 
-        r = get(listing_url)
-        soup = BeautifulSoup(r.text, "html.parser")
+        r = self.get(listing_url)
+        soup = self.soup(r, "html.parser")
         rows = soup.select("article, .job, .job-search-result, .job-list-item, .job-link")
         if not rows:
             rows = soup.select("a[href*='/job/']")
-        jobs: List[JobRecord] = []
-
-        links_seen = set()
+        links: List[str] = []
         for node in rows:
             a = node if node.name == "a" else node.select_one("a[href*='/job/']")
             if not a:
                 continue
-            href = urljoin(listing_url, a.get("href"))
-            if href in links_seen:
-                continue
-            links_seen.add(href)
-            try:
-                jr = self._parse_job_page(href)
-                if jr:
-                    jobs.append(jr)
-            except Exception:
-                logging.exception("PageUp item failed: %s", href)
-        return jobs
+            links.append(urljoin(listing_url, a.get("href")))
+        return self.map_details(self._parse_job_page, links)
 
     def _parse_job_page(self, url: str) -> Optional[JobRecord]:
-        r = get(url)
-        soup = BeautifulSoup(r.text, "html.parser")
+        r = self.get(url)
+        soup = self.soup(r, "html.parser")
         title = clean_text((soup.select_one("h1,h2,.job-title") or {}).get_text(" ", strip=True)
                            if soup.select_one("h1,h2,.job-title") else None)
         text = soup.get_text(" ", strip=True)
@@ -236,7 +459,7 @@ class PageUpAdapter(BaseAdapter):
             r"(?i)(?:Salary|Classification|Remuneration)\s*[:\-]\s*([^|•\n\r]+)",
             r"(?i)\bBand\s*\d+\w?\b[^|•\n\r]*"
         ], text)
-        band = find_first([r"(?i)\bBand\s*\d+\w?\b"], text)
+        band = band_of(text)
         posted = find_first([r"(?i)(?:Posted on|Advertised|Publication date)\s*[:\-]\s*([^\n\r]+)"], text)
         closing = find_first([r"(?i)(?:Closes|Closing|Applications close)\s*[:\-]\*?\s*([^\n\r]+)"], text)
         employment_type = find_first([r"(?i)(?:Work type|Employment Type)\s*[:\-]\s*([^\n\r|•]+)"], text)
@@ -266,39 +489,34 @@ class PageUpAdapter(BaseAdapter):
 
 # -------- Scout / BigRedSky / Mercury --------
 
+@register_adapter("scout", hosts=("centralgoldfieldscareers.com.au",),
+                  keywords=("scouttalent", "bigredsky", "mercury"))
 class ScoutAdapter(BaseAdapter):
     engine_name = "scout"
 
     def fetch(self) -> List[JobRecord]:
-        r = get(self.start_url)
-        soup = BeautifulSoup(r.text, "html.parser")
+        r = self.get(self.start_url)
+        soup = self.soup(r, "html.parser")
         items = soup.select("a[href*='/Vacancies/']")
         if not items:
             items = soup.select("a[href*='/title/']")
         links = []
         for a in items:
             href = urljoin(self.start_url, a.get("href"))
-            if re.search(r"/Vacancies/\d+", href) and href not in links:
+            if re.search(r"/Vacancies/\d+", href):
                 links.append(href)
-
-        jobs: List[JobRecord] = []
-        for href in links:
-            try:
-                jobs.append(self._parse(href))
-            except Exception:
-                logging.exception("Scout parse failed: %s", href)
-        return jobs
+        return self.map_details(self._parse, links)
 
     def _parse(self, url: str) -> JobRecord:
-        r = get(url)
-        soup = BeautifulSoup(r.text, "html.parser")
+        r = self.get(url)
+        soup = self.soup(r, "html.parser")
         title = clean_text(soup.select_one("h1,h2,.job-title").get_text(" ", strip=True)
                            if soup.select_one("h1,h2,.job-title") else None)
         text = soup.get_text(" ", strip=True)
         closing = find_first([r"(?i)Closing\s*(?:Date)?\s*[:\-]\s*([^\n\r]+)"], text)
         posted = find_first([r"(?i)(?:Posted|Advertised)\s*[:\-]\s*([^\n\r]+)"], text)
         salary = find_first([r"(?i)(?:Salary|Remuneration)\s*[:\-]\s*([^\n\r]+)"], text)
-        band = find_first([r"(?i)\bBand\s*\d+\w?\b"], text)
+        band = band_of(text)
         employment_type = find_first([r"(?i)(?:Work\s*Type|Employment\s*Type)\s*[:\-]\s*([^\n\r]+)"], text)
         location = find_first([r"(?i)(?:Location)\s*[:\-]\s*([^\n\r]+)"], text)
 
@@ -323,49 +541,41 @@ class ScoutAdapter(BaseAdapter):
 
 # -------- ApplyNow (Job Giant) --------
 
+@register_adapter("applynow", hosts=("applynow.net.au",))
 class ApplyNowAdapter(BaseAdapter):
     engine_name = "applynow"
+    max_pages = 20
 
     def fetch(self) -> List[JobRecord]:
-        r = get(self.start_url)
-        soup = BeautifulSoup(r.text, "lxml")
-        # listing cards are anchors to /applyjob/<id> or /jobs/…/<slug>
-        anchors = soup.select("a[href*='/applyjob/'], a[href*='/jobs/']")
         links = []
-        for a in anchors:
-            href = urljoin(self.start_url, a.get("href"))
-            # heuristic: detail pages contain /jobs/<...> or /applyjob/<id> with numeric id
-            if re.search(r"/applyjob/\d+|/jobs/", href) and href not in links:
-                links.append(href)
-
-        jobs: List[JobRecord] = []
-        seen = set()
-        for href in links:
-            # prefer non-apply URLs for richer content if both exist
-            if "/applyjob/" in href:
-                key = href.replace("/applyjob/", "/jobs/")
-            else:
-                key = href
-            if key in seen:
-                continue
-            seen.add(key)
-
-            try:
-                jobs.append(self._parse_detail(href))
-            except Exception:
-                logging.exception("ApplyNow parse failed: %s", href)
-        return jobs
+        page_url: Optional[str] = self.start_url
+        visited = set()
+        while page_url and page_url not in visited and len(visited) < self.max_pages:
+            visited.add(page_url)
+            soup = self.soup(self.get(page_url), "lxml")
+            # listing cards are anchors to /applyjob/<id> or /jobs/…/<slug>
+            for a in soup.select("a[href*='/applyjob/'], a[href*='/jobs/']"):
+                href = urljoin(page_url, a.get("href"))
+                # heuristic: detail pages contain /jobs/<...> or /applyjob/<id> with numeric id
+                if re.search(r"/applyjob/\d+|/jobs/", href):
+                    links.append(href)
+            page_url = next_page_url(soup, page_url)
+
+        # prefer non-apply URLs for richer content; /jobs/ and /applyjob/ URLs carry different keys
+        # (see canonical.py), so map_details only collapses repeats of the same form
+        links.sort(key=lambda h: "/applyjob/" in h)
+        return self.map_details(self._parse_detail, links)
 
     def _parse_detail(self, url: str) -> JobRecord:
-        r = get(url)
-        soup = BeautifulSoup(r.text, "lxml")
+        r = self.get(url)
+        soup = self.soup(r, "lxml")
         title = clean_text((soup.select_one("h1,h2,.job-title") or {}).get_text(" ", strip=True)
                            if soup.select_one("h1,h2,.job-title") else None)
         text = soup.get_text(" ", strip=True)
         posted = find_first([r"(?i)(Advertised|Posted)\s*[:\-]\s*([^\n\r]+)"], text)
         closing = find_first([r"(?i)(Closes|Closing)\s*[:\-]\s*([^\n\r]+)"], text)
         salary = find_first([r"(?i)(?:Salary|Remuneration)\s*[:\-]\s*([^\n\r]+)"], text)
-        band = find_first([r"(?i)\bBand\s*\d+\w?\b"], text)
+        band = band_of(text)
         employment_type = find_first([r"(?i)(?:Employment Type|Work Type)\s*[:\-]\s*([^\n\r]+)"], text)
         location = find_first([r"(?i)(?:Location)\s*[:\-]\s*([^\n\r]+)"], text)
         main = soup.select_one("#content, .content, main, .job, article") or soup
@@ -389,38 +599,32 @@ class ApplyNowAdapter(BaseAdapter):
 
 # -------- RecruitmentHub / Talent Propeller --------
 
+@register_adapter("recruitmenthub", hosts=("recruitmenthub.com.au", "talentpropellerjobs.com"))
 class RecruitmentHubAdapter(BaseAdapter):
     engine_name = "recruitmenthub"
 
     def fetch(self) -> List[JobRecord]:
-        r = get(self.start_url)
-        soup = BeautifulSoup(r.text, "lxml")
+        r = self.get(self.start_url)
+        soup = self.soup(r, "lxml")
         # cards link to /Vacancies/<id>/title/<slug> or similar
         anchors = soup.select("a[href*='/Vacancies/']")
         links: List[str] = []
         for a in anchors:
             href = urljoin(self.start_url, a.get("href"))
-            if re.search(r"/Vacancies/\d+/", href) and href not in links:
+            if re.search(r"/Vacancies/\d+/", href):
                 links.append(href)
-
-        jobs: List[JobRecord] = []
-        for href in links:
-            try:
-                jobs.append(self._parse_detail(href))
-            except Exception:
-                logging.exception("RecruitmentHub parse failed: %s", href)
-        return jobs
+        return self.map_details(self._parse_detail, links)
 
     def _parse_detail(self, url: str) -> JobRecord:
-        r = get(url)
-        soup = BeautifulSoup(r.text, "lxml")
+        r = self.get(url)
+        soup = self.soup(r, "lxml")
         title = clean_text((soup.select_one("h1,h2,.job-title") or {}).get_text(" ", strip=True)
                            if soup.select_one("h1,h2,.job-title") else None)
         text = soup.get_text(" ", strip=True)
         posted = find_first([r"(?i)(Posted|Advertised)\s*[:\-]\s*([^\n\r]+)"], text)
         closing = find_first([r"(?i)(Closes|Closing)\s*[:\-]\s*([^\n\r]+)"], text)
         salary = find_first([r"(?i)(?:Salary|Remuneration)\s*[:\-]\s*([^\n\r]+)"], text)
-        band = find_first([r"(?i)\bBand\s*\d+\w?\b"], text)
+        band = band_of(text)
         employment_type = find_first([r"(?i)(?:Employment Type|Work Type)\s*[:\-]\s*([^\n\r]+)"], text)
         location = find_first([r"(?i)(?:Location)\s*[:\-]\s*([^\n\r]+)"], text)
         main = soup.select_one("#content, .content, main, .job, article") or soup
@@ -442,45 +646,137 @@ class RecruitmentHubAdapter(BaseAdapter):
             source_engine=self.engine_name
         )
 
+# -------- Dayforce (Ceridian) candidate portal --------
+
+@register_adapter("dayforce", hosts=("jobs.dayforcehcm.com",))
+class DayforceAdapter(BaseAdapter):
+    """
+    The portal (jobs.dayforcehcm.com/<culture>/<client>/<board>) is a client-side
+    app whose HTML holds no jobs. Its search API returns complete postings,
+    descriptions included, so a board costs one POST per page of results.
+    The API has no modified-since filter, and with no detail fetches there is
+    nothing for one to save. The start URL may also be a council page that
+    links to the portal.
+    """
+    engine_name = "dayforce"
+    host = "jobs.dayforcehcm.com"
+    page_size = 100
+    max_pages = 20
+    PORTAL_RE = re.compile(r"^/(?:(?P<culture>[a-z]{2}-[A-Za-z]{2})/)?(?P<client>[^/]+)/(?P<board>[^/]+)", re.I)
+
+    def portal(self) -> Tuple[str, str, str]:
+        """(culture, client namespace, job board code) of this source's portal."""
+        url = self.start_url
+        if (urlparse(url).hostname or "").lower() != self.host:
+            soup = self.soup(self.get(url), "lxml")
+            a = soup.select_one(f"a[href*='{self.host}']")
+            if a is None:
+                raise ValueError(f"no Dayforce portal link on {url}")
+            url = urljoin(url, a["href"])
+        m = self.PORTAL_RE.match(urlparse(url).path)
+        if not m:
+            raise ValueError(f"not a Dayforce portal URL: {url}")
+        return m.group("culture") or "en-AU", m.group("client"), m.group("board")
+
+    def fetch(self) -> List[JobRecord]:
+        culture, client, board = self.portal()
+        api = f"https://{self.host}/api/geo/{client}/jobposting/search"
+        postings: List[Dict] = []
+        for _ in range(self.max_pages):
+            body = {"clientNamespace": client, "jobBoardCode": board, "cultureCode": culture,
+                    "distanceUnit": 0, "paginationStart": len(postings), "paginationCount": self.page_size}
+            data = self.get(api, method="POST", json=body).json()
+            page = data.get("jobPostings") or []
+            postings += page
+            if not page or len(postings) >= int(data.get("maxCount") or 0):
+                break
+        base = f"https://{self.host}/{culture}/{client}/{board}/jobs/"
+        links = {base + str(p.get("jobPostingId")): p for p in postings if p.get("jobPostingId")}
+        import canonical
+        return [self._record(url, links[url]) for url in canonical.unique(links)]
+
+    @staticmethod
+    def _local_date(stamp: Optional[str], end: bool = False) -> Optional[str]:
+        """
+        Victorian date of a UTC timestamp; in UTC, a board closing at local
+        midnight would read as a day early. end: an expiry, where exactly
+        00:00 means the ad closed at the end of the previous day.
+        """
+        try:
+            d = dt.datetime.fromisoformat((stamp or "").replace("Z", "+00:00"))
+        except ValueError:
+            return to_date_iso(stamp)
+        local = d.astimezone(AUS_TZ) if d.tzinfo else d
+        if end:
+            local -= dt.timedelta(microseconds=1)
+        return local.date().isoformat()
+
+    def _record(self, url: str, p: Dict) -> JobRecord:
+        desc_html = p.get("jobDescription") or p.get("jobPostingContent") or None
+        text = make_soup(desc_html, "lxml").get_text("\n", strip=True) if desc_html else ""
+        salary = find_first([r"(?i)(?:Salary|Remuneration)\s*[:\-]\s*([^\n\r]+)"], text)
+        locations = p.get("postingLocations") or []
+        location = locations[0].get("formattedAddress") or locations[0].get("cityName") if locations else None
+        return JobRecord(
+            council=self.council_name,
+            title=clean_text(p.get("jobTitle")) or "(untitled)",
+            link=url,
+            posted_date=self._local_date(p.get("postingStartTimestampUTC")),
+            closing_date=self._local_date(p.get("postingExpiryTimestampUTC"), end=True),
+            salary=clean_text(salary),
+            band=clean_text(band_of(text)),
+            employment_type=clean_text(p.get("employmentType") or p.get("jobType")),
+            work_arrangement=None,
+            location=clean_text(location),
+            description_html=desc_html,
+            scrape_date=now_iso(),
+            source_engine=self.engine_name
+        )
+
 # -------- Hardened Generic HTML Fallback --------
 
+@register_adapter("generic")
 class GenericHTMLAdapter(BaseAdapter):
     engine_name = "generic"
 
     def fetch(self) -> List[JobRecord]:
-        r = get(self.start_url)
-        soup = BeautifulSoup(r.text, "lxml")
-        anchors = soup.select("a[href]")
-        jobs: List[JobRecord] = []
-        seen = set()
-        for a in anchors:
-            href = urljoin(self.start_url, a.get("href") or "")
-            if href in seen:
-                continue
-            seen.add(href)
-
-            # follow likely job detail links
-            if not re.search(r"/(job|vacanc|opportunit|positions?|careers?/[^#]*\d)", href, flags=re.I):
-                continue
-            # skip obvious listing/system pages
-            if re.search(r"/(mysubmissions|profile|sitemap|info/help|help|site-?map)\b", href, flags=re.I):
-                continue
-            # skip pure listing pages (no digits)
-            if re.search(r"/(careers|employment|vacancies|jobs)(/|$)", href, flags=re.I) and not re.search(r"\d", href):
-                continue
-
+        import discovery
+        soup = self.soup(self.get(self.start_url), "lxml")
+        anchors = soup.select(self.tuning.selectors.get("link") or "a[href]")
+        listed = [href for href in (urljoin(self.start_url, a.get("href") or "") for a in anchors)
+                  if discovery.looks_like_job(href)]
+        # the live listing decides which jobs are open; a sitemap/feed's lastmod only spares
+        # re-fetching listed jobs that have not changed. Its entries stand in for the listing
+        # only when the page shows no job links at all (e.g. a client-side rendered list).
+        entries = discovery.discover(self.get, self.start_url, self.tuning.discovery)
+        if not entries:
+            for feed in discovery.feed_links(soup, self.start_url):
+                entries = discovery.job_entries(discovery.read_entries(self.get, feed), self.start_url)
+                if entries:
+                    break
+        candidates = listed or [e.url for e in entries]
+        lastmod = {e.url: e.lastmod for e in entries if e.lastmod is not None}
+
+        links, jobs = self.plan_details(candidates, lastmod)
+        failures = 0
+        for href in links:
             try:
                 jr = self._parse_detail(href)
                 if jr:
                     jobs.append(jr)
-            except Exception:
-                pass
+            except (DeadlineExceeded, CircuitOpen):
+                raise
+            except Exception as e:
+                failures += 1
+                logging.debug("generic parse failed: %s (%s)", href, e)
+        if failures:
+            logging.warning("%s: %d detail page(s) failed to parse", self.council_name, failures)
         return jobs
 
     def _parse_detail(self, url: str) -> Optional[JobRecord]:
-        r = get(url)
-        soup = BeautifulSoup(r.text, "lxml")
-        title_node = soup.select_one("h1, h2, .title, .job-title")
+        r = self.get(url)
+        soup = self.soup(r, "lxml")
+        title_node = soup.select_one(self.tuning.selectors.get("title") or "h1, h2, .title, .job-title")
         if not title_node:
             return None
         title = clean_text(title_node.get_text(" ", strip=True))
@@ -488,10 +784,12 @@ class GenericHTMLAdapter(BaseAdapter):
         closing = find_first([r"(?i)Closing\s*(?:Date)?\s*[:\-]\s*([^\n\r]+)"], text)
         posted = find_first([r"(?i)Posted\s*(?:on|date)?\s*[:\-]\s*([^\n\r]+)"], text)
         salary = find_first([r"(?i)(?:Salary|Remuneration)\s*[:\-]\s*([^\n\r]+)"], text)
-        band = find_first([r"(?i)\bBand\s*\d+\w?\b"], text)
+        band = band_of(text)
         employment_type = find_first([r"(?i)(?:Employment Type|Work Type)\s*[:\-]\s*([^\n\r]+)"], text)
         location = find_first([r"(?i)(?:Location)\s*[:\-]\s*([^\n\r]+)"], text)
-        desc_html = html_of(soup.select_one("main") or soup.select_one("#content") or soup)
+        desc_sel = self.tuning.selectors.get("description")
+        desc_html = html_of((desc_sel and soup.select_one(desc_sel)) or
+                            soup.select_one("main") or soup.select_one("#content") or soup)
 
         return JobRecord(
             council=self.council_name,
@@ -511,106 +809,147 @@ class GenericHTMLAdapter(BaseAdapter):
 
 # -------- Adapter Router --------
 
-def pick_adapter(council_name: str, url: str) -> BaseAdapter:
-    host = urlparse(url).netloc.lower()
-    path = urlparse(url).path.lower()
-
-    if "pulsesoftware.com" in host:
-        return PulseRCMAdapter(council_name, url)
-    if "careers.pageuppeople.com" in host:
-        return PageUpAdapter(council_name, url)
-    if "centralgoldfieldscareers.com.au" in host:
-        return ScoutAdapter(council_name, url)
-    if "scouttalent" in host or "bigredsky" in host or "mercury" in host:
-        return ScoutAdapter(council_name, url)
-    if "applynow.net.au" in host:
-        return ApplyNowAdapter(council_name, url)
-    if "recruitmenthub.com.au" in host or "talentpropellerjobs.com" in host:
-        return RecruitmentHubAdapter(council_name, url)
-    if "recruitment.wyndham.vic.gov.au" in host:
-        return GenericHTMLAdapter(council_name, url)
-    return GenericHTMLAdapter(council_name, url)
+def pick_adapter(council_name: str, url: str, vendor: Optional[str] = None,
+                 tuning: Optional[Tuning] = None) -> BaseAdapter:
+    """Registry vendor first, then host-suffix match (see registry.register_adapter), else generic."""
+    return route(url, vendor)(council_name, url, tuning)
 
 # -------- Default councils (fallback) --------
 
 DEFAULT_COUNCILS = [
-    ("City of Ballarat", "https://ballarat.pulsesoftware.com/Pulse/jobs"),
-    ("Central Goldfields Shire", "https://centralgoldfieldscareers.com.au/Vacancies/"),
-    ("Wyndham City", "https://recruitment.wyndham.vic.gov.au/careers/latest-jobs"),
+    Source("City of Ballarat", "https://ballarat.pulsesoftware.com/Pulse/jobs", "pulse"),
+    Source("Central Goldfields Shire", "https://centralgoldfieldscareers.com.au/Vacancies/", "scout"),
+    Source("Wyndham City", "https://recruitment.wyndham.vic.gov.au/careers/latest-jobs", "generic"),
 ]
 
 # -------- Registry loader (YAML/JSON) --------
 
-def load_registry(path: str) -> List[Tuple[str, str]]:
+def load_registry(path: str) -> List[Source]:
     """
     Accepts:
-      YAML: { version, councils: [ {name, active, starts: [...]} ] }
+      YAML: { version, councils: [ {name, active, vendor, lga_code, starts: [...], tuning} ] }
       JSON: [ {name, url} ]  (legacy)
-    Returns List[(council_name, start_url)]
+    Returns one Source per active start URL (see registry.py for validation and caching).
     """
-    p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"Registry not found: {path}")
-    text = p.read_text(encoding="utf-8")
-    data: Any = None
-    if p.suffix.lower() in {".yaml", ".yml"}:
-        try:
-            import yaml
-        except Exception as e:
-            raise RuntimeError("PyYAML not installed. Add 'PyYAML' to requirements.txt.") from e
-        data = yaml.safe_load(text)
-    else:
-        try:
-            data = json.loads(text)
-        except json.JSONDecodeError:
-            import yaml
-            data = yaml.safe_load(text)
-
-    out: List[Tuple[str, str]] = []
-    if isinstance(data, dict) and "councils" in data:
-        for row in data.get("councils") or []:
-            if not row:
-                continue
-            name = (row.get("name") or "").strip()
-            active = row.get("active", True)
-            starts = row.get("starts") or []
-            if not name or not active:
-                continue
-            for u in starts:
-                u = (u or "").strip()
-                if u:
-                    out.append((name, u))
-        return out
-
-    if isinstance(data, list):
-        for row in data:
-            if not row:
-                continue
-            name = (row.get("name") or "").strip()
-            url = (row.get("url") or "").strip()
-            if name and url:
-                out.append((name, url))
-        return out
-
-    raise RuntimeError(f"Unrecognised registry schema in {path}")
+    return load_sources(path)
 
 # -------- Runner --------
 
-def scrape_all(councils: List[Tuple[str, str]], inter_council_delay: float = 0.0) -> List[JobRecord]:
+def scrape_all(councils: List[Source], inter_council_delay: float = 0.0,
+               failed: Optional[set] = None, council_timeout: float = 0.0,
+               breaker: Optional[CircuitBreaker] = None,
+               fallback: Optional[Callable[[set], List[JobRecord]]] = None,
+               index: Optional["JobIndex"] = None, profiler=None,
+               capture: Optional["CaptureWriter"] = None) -> List[JobRecord]:
+    """
+    failed: if given, collects the names of councils whose scrape raised.
+    council_timeout: wall-clock seconds per council across all its start URLs (0 = no limit).
+    breaker: shared per-host circuit breaker.
+    fallback: called with the failed council names; its (stale) records stand in for them.
+    index: job-ID index shared by all adapters (a fresh one is used when None).
+    profiler: profiling.RunProfiler; each council is profiled as one section, with
+        detail pages fetched serially so cProfile sees them.
+    capture: if given, every response is recorded to its WARC archive (see capture.py).
+    """
+    from canonical import JobIndex
+    index = JobIndex() if index is None else index
+    failed = set() if failed is None else failed
+    deadlines = {}
     all_jobs: List[JobRecord] = []
-    for idx, (name, url) in enumerate(councils, 1):
+    for idx, src in enumerate(councils, 1):
+        name, url = src.council, src.url
+        tuning = replace(src.tuning, concurrency=1) if profiler else src.tuning
         try:
-            adapter = pick_adapter(name, url)
+            adapter = pick_adapter(name, url, src.vendor, tuning)
+            if council_timeout > 0:
+                adapter.deadline = deadlines.setdefault(name, Deadline(council_timeout))
+            adapter.breaker = breaker
+            adapter.index = index
+            adapter.capture = capture
             logging.info("(%02d/%02d) %s via %s :: %s", idx, len(councils), name, adapter.engine_name, url)
-            jobs = adapter.fetch()
+            with profiler.section(f"council/{name}") if profiler else nullcontext():
+                jobs = adapter.fetch()
             logging.info("Scraped %d jobs from %s", len(jobs), name)
             all_jobs.extend(jobs)
+        except (DeadlineExceeded, CircuitOpen) as e:
+            logging.warning("Abandoned council: %s (%s): %s", name, url, e)
+            failed.add(name)
         except Exception:
             logging.exception("Failed council: %s (%s)", name, url)
+            failed.add(name)
         if inter_council_delay > 0 and idx < len(councils):
             time.sleep(inter_council_delay)
+    if index.skipped or index.reused or index.unmodified:
+        logging.info("Job index: %d duplicate links skipped, %d jobs reused from history, "
+                     "%d unchanged since last fetch (sitemap lastmod)",
+                     index.skipped, index.reused, index.unmodified)
+    if breaker is not None and breaker.open_hosts():
+        logging.warning("Circuit open for: %s", ", ".join(breaker.open_hosts()))
+    if BYTES is not None:
+        BYTES.log()
+    if failed and fallback is not None:
+        # a council that partly succeeded on another start URL still counts as failed
+        stale = fallback(failed)
+        logging.info("Reusing %d stale records for %d failed councils", len(stale), len(failed))
+        all_jobs.extend(stale)
     return dedupe_by_link(all_jobs)
 
+def stale_fallback(history: Path) -> Callable[[set], List[JobRecord]]:
+    """Fallback for scrape_all: each failed council's last good run from the history, marked stale."""
+    import scheduler
+
+    def load(councils: set) -> List[JobRecord]:
+        snap = last_good_snapshot(scheduler.read_history(history), councils)
+        return [record_from(r, stale=True) for recs in snap.values() for r in recs]
+    return load
+
+# -------- Replay --------
+
+_replay: Optional["Replay"] = None
+
+def _init_replay(path: str) -> None:
+    """Load the capture (in each worker process) and date records as of the captured run."""
+    global _replay, SCRAPE_TIME
+    from capture import Replay
+    _replay = Replay(Path(path))
+    if _replay.started:
+        started = dt.datetime.fromisoformat(_replay.started.replace("Z", "+00:00"))
+        SCRAPE_TIME = started.astimezone(AUS_TZ).isoformat(timespec="seconds")
+
+def _replay_source(src: Source) -> Tuple[str, List[JobRecord], Optional[str]]:
+    try:
+        adapter = pick_adapter(src.council, src.url, src.vendor,
+                               replace(src.tuning, concurrency=1, rate_limit=0.0))
+        adapter.replay = _replay
+        return src.council, adapter.fetch(), None
+    except Exception as e:
+        return src.council, [], f"{type(e).__name__}: {e}"
+
+def replay_all(councils: List[Source], archive: Path, workers: int = 1) -> List[JobRecord]:
+    """
+    Re-run the adapters over a captured run instead of the network, one
+    council per task across `workers` processes. Councils absent from the
+    capture are skipped; pages missing from it fail like network errors.
+    """
+    global _replay, SCRAPE_TIME
+    _init_replay(str(archive))
+    sources = [s for s in councils if s.council in _replay.councils]
+    logging.info("Replaying %s: %d start URLs, %d responses", archive.name, len(sources), len(_replay.responses))
+    if workers > 1 and len(sources) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_replay, initargs=(str(archive),)) as ex:
+            results = list(ex.map(_replay_source, sources))
+    else:
+        results = [_replay_source(s) for s in sources]
+    _replay, SCRAPE_TIME = None, None
+
+    jobs: List[JobRecord] = []
+    for council, recs, error in results:
+        if error:
+            logging.warning("Replay failed for %s: %s", council, error)
+        jobs.extend(recs)
+    return dedupe_by_link(jobs)
+
 def dedupe_by_link(jobs: List[JobRecord]) -> List[JobRecord]:
     seen = set()
     out: List[JobRecord] = []
@@ -622,43 +961,165 @@ def dedupe_by_link(jobs: List[JobRecord]) -> List[JobRecord]:
         out.append(j)
     return out
 
-def main():
+def write_records(jobs: List[JobRecord], out: Optional[str], append: bool = False) -> None:
+    if out in ("-", "", None):
+        sink = sys.stdout
+        close_after = False
+    else:
+        sink = open(out, "a" if append else "w", encoding="utf-8")
+        close_after = True
+    try:
+        for j in jobs:
+            sink.write(json.dumps(asdict(j), ensure_ascii=False) + "\n")
+    finally:
+        if close_after:
+            sink.close()
+    logging.info("Wrote %d records", len(jobs))
+
+def main(argv: Optional[List[str]] = None):
+    import http_bytes
     parser = argparse.ArgumentParser(description="Bandsight council job scraper")
     parser.add_argument("--councils", help="Path to YAML/JSON registry (see README)", default=None)
     parser.add_argument("--out", help="Output JSONL file (default stdout)", default="-")
     parser.add_argument("--append", help="Append to output file instead of overwrite", action="store_true")
     parser.add_argument("--delay", help="Seconds to sleep between councils (float)", type=float, default=0.0)
     parser.add_argument("--log", help="Log level", default="INFO")
-    args = parser.parse_args()
+    parser.add_argument("--schedule", default=None,
+                        help="Scheduler state (JSON); scrape only councils due by learned cadence")
+    parser.add_argument("--history", default=None,
+                        help="History JSONL the scheduler learns from (default: --out when appending)")
+    parser.add_argument("--request-budget", dest="request_budget", type=int, default=0,
+                        help="Approximate max requests per run when scheduling (0 = unlimited)")
+    parser.add_argument("--council-timeout", dest="council_timeout", type=float, default=300.0,
+                        help="Wall-clock seconds allowed per council (0 = unlimited)")
+    parser.add_argument("--breaker-threshold", dest="breaker_threshold", type=int, default=5,
+                        help="Consecutive failures before a host is skipped for the rest of the run (0 = never)")
+    parser.add_argument("--reuse-days", dest="reuse_days", type=float, default=0.0,
+                        help="Reuse history records scraped within this many days instead of refetching "
+                             "their detail pages (0 = always refetch)")
+    parser.add_argument("--seen-db", dest="seen_db", default=None,
+                        help="Seen-state store (SQLite) to update with first/last seen and closures")
+    parser.add_argument("--seen-ttl-days", dest="seen_ttl_days", type=int, default=180,
+                        help="Prune seen-state entries closed or unseen for this many days")
+    parser.add_argument("--open-jobs", dest="open_jobs", default=None,
+                        help="Open-jobs snapshot (JSONL) to update with this run: scraped councils' listings "
+                             "replace their old jobs and closed jobs are swept (see open_jobs.py)")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="Profile each council (cProfile); write .pstats and profile.json to DIR")
+    parser.add_argument("--capture", default=None, metavar="DIR",
+                        help="Record every fetched response into DIR/<run start>.warc.gz")
+    parser.add_argument("--replay", nargs="+", default=None, metavar="WARC",
+                        help="Re-extract records from captured runs instead of fetching (no scheduling/seen state)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used by --replay")
+    parser.add_argument("--shard", default=None, metavar="I/N",
+                        help="Scrape only shard I of N (councils split by stable hash); also writes "
+                             "<out>.manifest.json for `bandsight merge`")
+    parser.add_argument("--max-bytes", dest="max_bytes", type=int, default=http_bytes.DEFAULT_MAX_BYTES,
+                        help="Truncate any response body past this many bytes (0 = unlimited)")
+    parser.add_argument("--encoding-cache", dest="encoding_cache", default=None, metavar="PATH",
+                        help="JSON of per-host detected charsets, reused across runs")
+    parser.add_argument("--dry-run", dest="dry_run", action="store_true",
+                        help="Print each start URL's adapter and exit without fetching")
+    args = parser.parse_args(argv)
+    if args.shard:
+        import sharding
+        try:
+            shard = sharding.parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.out in ("-", "") or args.append:
+            parser.error("--shard writes its own file: give --out and no --append (merge appends)")
 
     logging.basicConfig(
         level=getattr(logging, args.log.upper(), logging.INFO),
         format="%(asctime)s %(levelname)s %(message)s"
     )
 
+    global MAX_RESPONSE_BYTES, ENCODINGS
+    MAX_RESPONSE_BYTES = args.max_bytes
+    ENCODINGS = http_bytes.EncodingCache(Path(args.encoding_cache) if args.encoding_cache else None)
+
     councils = load_registry(args.councils) if args.councils else DEFAULT_COUNCILS
     logging.info("Loaded %d council start URLs", len(councils))
-    for n, (nm, u) in enumerate(councils[:10], 1):
-        logging.debug(" [%02d] %s -> %s", n, nm, u)
-
-    jobs = scrape_all(councils, inter_council_delay=args.delay)
-
-    if args.out in ("-", "", None):
-        sink = sys.stdout
-        close_after = False
-    else:
-        mode = "a" if args.append else "w"
-        sink = open(args.out, mode, encoding="utf-8")
-        close_after = True
-
-    try:
-        for j in jobs:
-            sink.write(json.dumps(asdict(j), ensure_ascii=False) + "\n")
-    finally:
-        if close_after:
-            sink.close()
-
-    logging.info("Wrote %d records", len(jobs))
+    if args.shard:
+        councils = sharding.select(councils, *shard)
+        logging.info("Shard %s: %d start URLs across %d councils", args.shard, len(councils),
+                     len({s.council for s in councils}))
+    for n, src in enumerate(councils[:10], 1):
+        logging.debug(" [%02d] %s -> %s (%s)", n, src.council, src.url, src.vendor or "auto")
+    if args.replay:
+        jobs = []
+        for path in args.replay:
+            jobs += replay_all(councils, Path(path), args.workers)
+        write_records(jobs, args.out, args.append)
+        return
+
+    history = args.history or (args.out if args.append and args.out not in ("-", "") else None)
+    state = None
+    if args.schedule:
+        import scheduler
+        stats = scheduler.council_stats(scheduler.read_history(Path(history))) if history else {}
+        state = scheduler.load_state(Path(args.schedule))
+        councils = scheduler.plan(councils, stats, state, args.request_budget)
+
+    if args.dry_run:
+        for src in councils:
+            adapter = pick_adapter(src.council, src.url, src.vendor, src.tuning)
+            print(f"{src.council}\t{adapter.engine_name}\t{src.url}")
+        return
+
+    run_started = dt.datetime.now(dt.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+    failed: set = set()
+    profiler = None
+    if args.profile:
+        from profiling import RunProfiler
+        profiler = RunProfiler(Path(args.profile))
+    capture = None
+    if args.capture:
+        from capture import CaptureWriter
+        capture = CaptureWriter(Path(args.capture))
+    from canonical import JobIndex
+    index = JobIndex()
+    if history:
+        import scheduler
+        index = JobIndex.from_history(scheduler.read_history(Path(history)), args.reuse_days)
+    jobs = scrape_all(councils, inter_council_delay=args.delay, failed=failed,
+                      council_timeout=args.council_timeout,
+                      breaker=CircuitBreaker(args.breaker_threshold),
+                      fallback=stale_fallback(Path(history)) if history else None,
+                      index=index, profiler=profiler, capture=capture)
+    if capture is not None:
+        capture.close()
+        logging.info("Captured %d responses to %s", capture.records, capture.path)
+    ENCODINGS.save()
+    if state is not None:
+        scheduler.mark_scraped(state, {s.council for s in councils} - failed)
+        scheduler.save_state(Path(args.schedule), state)
+
+    if args.seen_db:
+        import seen_store
+        with seen_store.SeenStore(Path(args.seen_db)) as store:
+            store.observe(asdict(j) for j in jobs if not j.stale)
+            closed = store.mark_closed({s.council for s in councils} - failed, run_started)
+            pruned = store.prune(args.seen_ttl_days)
+        logging.info("Seen state: %d closed, %d pruned", closed, pruned)
+    if args.open_jobs:
+        import open_jobs
+        counts = open_jobs.update(Path(args.open_jobs), (asdict(j) for j in jobs),
+                                  {s.council for s in councils} - failed)
+        logging.info("Open jobs: %(open)d open, %(added)d added, %(dropped)d delisted", counts)
+
+    if args.append and history == args.out:
+        # the history already holds the last good run; re-appending it would fake a re-scrape
+        jobs = [j for j in jobs if not j.stale]
+    with profiler.section("serialise") if profiler else nullcontext():
+        write_records(jobs, args.out, args.append)
+    if args.shard:
+        sharding.write_manifest(Path(args.out), args.shard, run_started,
+                                {s.council for s in councils} - failed, failed)
+    if profiler is not None:
+        logging.info("%s", profiler.write())
 
 if __name__ == "__main__":
     main()
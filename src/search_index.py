@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+search_index.py
+Static search index over open jobs, queried client-side from GitHub Pages.
+
+Layout under the search directory:
+  meta.json           {version, built, docs, shards: [prefix, ...], facets: [...]}
+  docs.json           {"<id>": {g, t, c, b, e, cl, l, s}}   guid, title, council, band,
+                                                            engine, closing, link, salary_min
+  facets.json         {facet: [[value, [ids]], ...]}   values sorted (bands by number,
+                                                       closing dates ascending)
+  terms/<prefix>.json {"title": {token: [ids]}, "body": {token: [ids]}}
+
+A token is a lower-cased alphanumeric word of two or more characters, minus
+stopwords. Its shard is its first two characters. A client tokenises the
+query the same way and fetches only those shards, plus facets.json and
+docs.json. Posting lists are sorted doc IDs. A body posting leaves out docs
+that already have the token in their title.
+
+Doc IDs stay stable between builds. They and each doc's tokens live in a
+state file (not published). Each build tokenises only new and changed jobs
+(by feed_delta fingerprint), and only rewrites the term shards those jobs
+touch.
+"""
+
+import datetime as dt
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import feed_delta
+import open_jobs
+
+VERSION = 1
+FACETS = ("council", "band", "engine", "closing_date")
+MIN_TOKEN = 2
+STOPWORDS = frozenset("""
+    an and are as at be by for from has have in is it its of on or our that the their this to
+    we will with you your who all any can may more not than then they us was were which would
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def tokens(text: Optional[str]) -> Set[str]:
+    if not text:
+        return set()
+    return {t for t in _TOKEN_RE.findall(text.lower()) if len(t) >= MIN_TOKEN and t not in STOPWORDS}
+
+def shard_of(token: str) -> str:
+    return token[:2]
+
+def _band_order(value: str) -> Tuple[float, str]:
+    m = re.search(r"\d+(?:\.\d+)?", value)
+    return (float(m.group()) if m else float("inf"), value)
+
+def _dump(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True) + "\n"
+
+def _write(path: Path, text: str) -> bool:
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+# -------- State --------
+
+def load_state(path: Path) -> Dict:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": VERSION, "next_id": 1, "docs": {}}
+    if state.get("version") != VERSION:
+        return {"version": VERSION, "next_id": 1, "docs": {}}
+    return state
+
+def save_state(path: Path, state: Dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, separators=(",", ":")) + "\n", encoding="utf-8")
+
+# -------- Build --------
+
+def doc_of(rec: Dict) -> Dict:
+    return {
+        "t": rec.get("title") or "(untitled)",
+        "c": rec.get("council") or "",
+        "b": rec.get("band") or "",
+        "e": rec.get("source_engine") or "",
+        "cl": rec.get("closing_date") or "",
+        "l": rec.get("link") or "",
+        "s": rec.get("salary_min"),
+    }
+
+def update(current: Dict[str, Dict], out_dir: Path, state_path: Path,
+           today: Optional[str] = None) -> Dict[str, int]:
+    """
+    Bring the index in out_dir up to date with the open jobs among current
+    (guid -> latest record). Returns counts of added/changed/removed docs and
+    of term shards written.
+    """
+    today = today or dt.date.today().isoformat()
+    state = load_state(state_path)
+    old_docs: Dict[str, Dict] = state["docs"]
+    new_docs: Dict[str, Dict] = {}
+    dirty: Set[str] = set()
+    stats = {"added": 0, "changed": 0, "removed": 0, "shards": 0}
+
+    for guid, rec in current.items():
+        if not open_jobs.is_open(rec, today):
+            continue
+        fp = feed_delta.fingerprint(rec) + ":" + (rec.get("council") or "") + ":" + (rec.get("source_engine") or "")
+        prev = old_docs.get(guid)
+        if prev is not None and prev["fp"] == fp:
+            new_docs[guid] = prev
+            continue
+        title = tokens(rec.get("title"))
+        body = tokens(feed_delta.clean_description(rec.get("description_html"))) - title
+        if prev is None:
+            doc_id = state["next_id"]
+            state["next_id"] += 1
+            stats["added"] += 1
+        else:
+            doc_id = prev["id"]
+            stats["changed"] += 1
+            dirty.update(shard_of(t) for t in prev["title"] + prev["body"])
+        new_docs[guid] = {"id": doc_id, "fp": fp, "doc": doc_of(rec),
+                          "title": sorted(title), "body": sorted(body)}
+        dirty.update(shard_of(t) for t in title | body)
+    for guid, prev in old_docs.items():
+        if guid not in new_docs:
+            stats["removed"] += 1
+            dirty.update(shard_of(t) for t in prev["title"] + prev["body"])
+
+    # postings are cheap to regroup from the stored token lists; only dirty shards are serialised
+    shards: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+    for d in new_docs.values():
+        for field in ("title", "body"):
+            for t in d[field]:
+                shard = shards.setdefault(shard_of(t), {"title": {}, "body": {}})
+                shard[field].setdefault(t, []).append(d["id"])
+    terms_dir = out_dir / "terms"
+    existing = {p.stem for p in terms_dir.glob("*.json")} if terms_dir.exists() else set()
+    for prefix in sorted(existing - set(shards)):
+        (terms_dir / f"{prefix}.json").unlink()
+    for prefix, shard in shards.items():
+        if prefix in dirty or prefix not in existing:
+            for postings in (shard["title"], shard["body"]):
+                for ids in postings.values():
+                    ids.sort()
+            stats["shards"] += _write(terms_dir / f"{prefix}.json", _dump(shard))
+
+    facets: Dict[str, Dict[str, List[int]]] = {f: {} for f in FACETS}
+    docs_out: Dict[str, Dict] = {}
+    for guid, d in new_docs.items():
+        doc = d["doc"]
+        docs_out[str(d["id"])] = dict(doc, g=guid)
+        for facet, value in zip(FACETS, (doc["c"], doc["b"], doc["e"], doc["cl"])):
+            if value:
+                facets[facet].setdefault(value, []).append(d["id"])
+    order: Dict[str, Callable] = {"band": lambda kv: _band_order(kv[0])}
+    facet_arrays = {f: [[v, sorted(ids)] for v, ids in sorted(vals.items(), key=order.get(f, lambda kv: kv[0]))]
+                    for f, vals in facets.items()}
+
+    _write(out_dir / "docs.json", _dump(docs_out))
+    _write(out_dir / "facets.json", _dump(facet_arrays))
+    meta = {"version": VERSION, "docs": len(new_docs), "shards": sorted(shards), "facets": list(FACETS),
+            "min_token": MIN_TOKEN, "stopwords": sorted(STOPWORDS)}
+    meta_path = out_dir / "meta.json"
+    try:
+        unchanged = {k: v for k, v in json.loads(meta_path.read_text(encoding="utf-8")).items() if k != "built"} == meta
+    except (OSError, ValueError):
+        unchanged = False
+    if not unchanged:
+        built = dt.datetime.now(dt.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        _write(meta_path, _dump(dict(meta, built=built)))
+
+    state["docs"] = new_docs
+    save_state(state_path, state)
+    return stats
+
+def current_jobs(rows: Iterable[Dict], guid_fn: Callable[[Dict], str]) -> Dict[str, Dict]:
+    """Each council's latest run, one record per job."""
+    return feed_delta.latest_by_guid(feed_delta.latest_run(rows), guid_fn)
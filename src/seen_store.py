@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+seen_store.py
+Persistent per-job seen state shared by the scraper and the feed builder.
+
+One SQLite table keyed by item GUID (sha1 of council|link):
+
+  guid | council | link | first_seen | last_seen | content_hash | closed_at
+
+Timestamps are UTC "YYYY-MM-DDTHH:MM:SSZ" strings, so they compare as text.
+The scraper upserts every record it fetches (first_seen only ever moves
+earlier, last_seen later) and marks jobs that vanished from a successfully
+scraped council as closed; entries closed or unseen for longer than the TTL
+are pruned. The builder looks first_seen up in bulk so a job's pubDate stays
+put across re-scrapes. An empty store is seeded from the JSONL history.
+"""
+
+import datetime as dt
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import feed_delta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    guid TEXT PRIMARY KEY,
+    council TEXT NOT NULL,
+    link TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    content_hash TEXT,
+    closed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS seen_council ON seen (council, last_seen);
+"""
+UPSERT = """
+INSERT INTO seen (guid, council, link, first_seen, last_seen, content_hash, closed_at)
+VALUES (?, ?, ?, ?, ?, ?, NULL)
+ON CONFLICT (guid) DO UPDATE SET
+    first_seen = min(first_seen, excluded.first_seen),
+    content_hash = CASE WHEN excluded.last_seen >= last_seen THEN excluded.content_hash ELSE content_hash END,
+    closed_at = CASE WHEN excluded.last_seen >= last_seen THEN NULL ELSE closed_at END,
+    last_seen = max(last_seen, excluded.last_seen)
+"""
+LOOKUP_CHUNK = 500  # stays under SQLite's bound-parameter limit
+DEFAULT_TTL_DAYS = 180
+
+@lru_cache(maxsize=None)
+def guid_of(council: str, link: str) -> str:
+    return hashlib.sha1(f"{council}|{link}".encode("utf-8")).hexdigest()
+
+def record_guid(rec: Dict) -> str:
+    return guid_of(rec.get("council") or "", rec.get("link") or "")
+
+def utc_stamp(s: Optional[str]) -> Optional[str]:
+    """ISO timestamp (naive = Melbourne AEDT, as the scraper writes) -> UTC Z string."""
+    if not s:
+        return None
+    try:
+        d = dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if d.tzinfo is None:
+        d = d.replace(tzinfo=dt.timezone(dt.timedelta(hours=11)))
+    return d.astimezone(dt.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+@dataclass(frozen=True)
+class SeenEntry:
+    guid: str
+    council: str
+    link: str
+    first_seen: str
+    last_seen: str
+    content_hash: Optional[str]
+    closed_at: Optional[str]
+
+class SeenStore:
+    def __init__(self, path: Path):
+        self.path = path
+        import sqlite3   # record_guid() alone (the builder's item GUIDs) does not need it
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self) -> "SeenStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT count(*) FROM seen").fetchone()[0]
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    # -------- Reads --------
+
+    def lookup(self, guids: Iterable[str]) -> Dict[str, SeenEntry]:
+        keys = list(dict.fromkeys(guids))
+        out: Dict[str, SeenEntry] = {}
+        for i in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[i:i + LOOKUP_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            for row in self.db.execute(f"SELECT * FROM seen WHERE guid IN ({marks})", chunk):
+                out[row[0]] = SeenEntry(*row)
+        return out
+
+    def first_seen(self, records: Iterable[Dict]) -> Dict[str, str]:
+        """guid -> first_seen for the given records (unknown jobs are left out)."""
+        return {g: e.first_seen for g, e in self.lookup(record_guid(r) for r in records).items()}
+
+    # -------- Writes --------
+
+    def observe(self, records: Iterable[Dict], seen_at: Optional[str] = None) -> int:
+        """
+        Upsert scraped records. seen_at overrides each record's scrape_date
+        (e.g. one timestamp per run). Returns the number of rows written.
+        """
+        rows = []
+        for r in records:
+            stamp = seen_at or utc_stamp(r.get("scrape_date"))
+            if not stamp:
+                continue
+            council, link = r.get("council") or "", r.get("link") or ""
+            rows.append((guid_of(council, link), council, link, stamp, stamp, feed_delta.fingerprint(r)))
+        self.db.executemany(UPSERT, rows)
+        self.db.commit()
+        return len(rows)
+
+    def mark_closed(self, councils: Iterable[str], run_started: str, closed_at: Optional[str] = None) -> int:
+        """Close open jobs of fully scraped councils that were not seen since run_started."""
+        closed_at = closed_at or dt.datetime.now(dt.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        n = 0
+        for council in councils:
+            cur = self.db.execute(
+                "UPDATE seen SET closed_at = ? WHERE council = ? AND last_seen < ? AND closed_at IS NULL",
+                (closed_at, council, run_started),
+            )
+            n += cur.rowcount
+        self.db.commit()
+        return n
+
+    def prune(self, ttl_days: int = DEFAULT_TTL_DAYS, now: Optional[dt.datetime] = None) -> int:
+        """Drop entries closed, or not seen at all, for more than ttl_days."""
+        cutoff = ((now or dt.datetime.now(dt.UTC)) - dt.timedelta(days=ttl_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        cur = self.db.execute("DELETE FROM seen WHERE closed_at < ? OR last_seen < ?", (cutoff, cutoff))
+        self.db.commit()
+        return cur.rowcount
+
+    def seed(self, history: Iterable[Dict]) -> int:
+        """Fill an empty store from the JSONL history; returns the number of jobs known afterwards."""
+        if len(self) == 0:
+            self.observe(history)
+        return len(self)
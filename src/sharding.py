@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+sharding.py
+Split a scrape across runners (scraper.py --shard i/N) and merge the shard
+outputs back into the job history.
+
+Councils are assigned to shards by a stable hash of the council name, so a
+council's start URLs always land in the same shard, whatever the registry
+order or Python's hash seed. Each shard writes its JSONL plus a
+"<out>.manifest.json" naming the councils it scraped and those that failed.
+
+merge reads the shard outputs and their manifests and combines them:
+  - records are deduplicated across shards by (council, link), preferring
+    fresh records over stale ones;
+  - the output is sorted by council, link and scrape_date, so identical
+    inputs always give identical bytes;
+  - the shared state is updated once, for the union of the shards: the seen
+    store (first/last seen, closures), the scheduler's last_run and the
+    open-jobs snapshot.
+
+Usage:
+  python src/scraper.py --councils data/councils.yaml --shard 0/4 --out shard-0.jsonl --history data/jobs_history.jsonl
+  python src/bandsight merge shard-*.jsonl --out data/jobs_history.jsonl --append --seen-db .cache/seen.db
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from registry import Source
+
+# -------- Assignment --------
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """"i/N" with 0 <= i < N."""
+    try:
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {spec!r}") from None
+    if not 0 <= i < n:
+        raise ValueError(f"shard index must be in 0..{n - 1}, got {spec!r}")
+    return i, n
+
+def shard_of(council: str, n: int) -> int:
+    digest = hashlib.sha1(council.strip().lower().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % n
+
+def select(sources: List[Source], i: int, n: int) -> List[Source]:
+    return [s for s in sources if shard_of(s.council, n) == i]
+
+def manifest_path(out: Path) -> Path:
+    return out.with_name(out.name + ".manifest.json")
+
+def write_manifest(out: Path, shard: str, run_started: str, scraped: Iterable[str], failed: Iterable[str]) -> None:
+    manifest_path(out).write_text(json.dumps({
+        "shard": shard,
+        "run_started": run_started,
+        "scraped": sorted(scraped),
+        "failed": sorted(failed),
+    }, indent=1) + "\n", encoding="utf-8")
+
+# -------- Merge --------
+
+def read_shard(path: Path) -> List[Dict]:
+    out = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue
+    return out
+
+def merge_records(shards: Iterable[List[Dict]]) -> List[Dict]:
+    """Cross-shard dedupe by (council, link), fresh over stale, in a deterministic order."""
+    def rank(r: Dict) -> Tuple[bool, str]:
+        # fresh before stale, then the earliest scrape, so the choice does not depend on input order
+        return bool(r.get("stale")), r.get("scrape_date") or ""
+
+    best: Dict[Tuple[str, str], Dict] = {}
+    for records in shards:
+        for r in records:
+            key = (r.get("council") or "", r.get("link") or "")
+            prev = best.get(key)
+            if prev is None or rank(r) < rank(prev):
+                best[key] = r
+    return sorted(best.values(), key=lambda r: (r.get("council") or "", r.get("link") or "", r.get("scrape_date") or ""))
+
+def load_manifests(inputs: List[Path]) -> List[Dict]:
+    manifests = []
+    for p in inputs:
+        mp = manifest_path(p)
+        if mp.exists():
+            manifests.append(json.loads(mp.read_text(encoding="utf-8")))
+        else:
+            logging.warning("%s has no manifest; its councils will not update seen/schedule state", p)
+    specs = [parse_shard(m["shard"]) for m in manifests]
+    if len({n for _, n in specs}) > 1:
+        raise SystemExit(f"shards disagree on N: {sorted(m['shard'] for m in manifests)}")
+    if len({i for i, _ in specs}) < len(specs):
+        raise SystemExit(f"duplicate shards: {sorted(m['shard'] for m in manifests)}")
+    if specs and len(specs) < specs[0][1]:
+        present = {i for i, _ in specs}
+        logging.warning("missing shards: %s", sorted(set(range(specs[0][1])) - present))
+    return manifests
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Merge shard outputs into the job history")
+    ap.add_argument("inputs", nargs="+", help="Shard JSONL files (scraper.py --shard … --out …)")
+    ap.add_argument("--out", default="data/jobs_history.jsonl", help="Merged JSONL (history when --append)")
+    ap.add_argument("--append", action="store_true", help="Append to --out instead of overwriting")
+    ap.add_argument("--seen-db", dest="seen_db", default=None,
+                    help="Seen-state store (SQLite) to update with the merged run")
+    ap.add_argument("--seen-ttl-days", dest="seen_ttl_days", type=int, default=180,
+                    help="Prune seen-state entries closed or unseen for this many days")
+    ap.add_argument("--schedule", default=None, help="Scheduler state (JSON) to mark scraped councils in")
+    ap.add_argument("--open-jobs", dest="open_jobs", default=None,
+                    help="Open-jobs snapshot (JSONL) to update with the merged run")
+    ap.add_argument("--log", default="INFO", help="Log level")
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log.upper(), logging.INFO),
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    inputs = sorted(Path(p) for p in args.inputs)
+    manifests = load_manifests(inputs)
+    shards = [read_shard(p) for p in inputs]
+    records = merge_records(shards)
+    logging.info("Merged %d records from %d shard(s) into %d", sum(map(len, shards)), len(inputs), len(records))
+
+    scraped = set().union(*(m["scraped"] for m in manifests)) if manifests else set()
+    if args.schedule and scraped:
+        import scheduler
+        state = scheduler.load_state(Path(args.schedule))
+        scheduler.mark_scraped(state, scraped)
+        scheduler.save_state(Path(args.schedule), state)
+    if args.seen_db:
+        import seen_store
+        run_started = min((m["run_started"] for m in manifests), default=None)
+        with seen_store.SeenStore(Path(args.seen_db)) as store:
+            store.observe(r for r in records if not r.get("stale"))
+            closed = store.mark_closed(scraped, run_started) if run_started else 0
+            pruned = store.prune(args.seen_ttl_days)
+        logging.info("Seen state: %d closed, %d pruned", closed, pruned)
+    if args.open_jobs:
+        import open_jobs
+        counts = open_jobs.update(Path(args.open_jobs), records, scraped)
+        logging.info("Open jobs: %(open)d open, %(added)d added, %(dropped)d delisted", counts)
+
+    if args.append:
+        # the history already holds the last good run; re-appending it would fake a re-scrape
+        records = [r for r in records if not r.get("stale")]
+    with open(args.out, "a" if args.append else "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    logging.info("Wrote %d records to %s", len(records), args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+DayforceAdapter.fetch() offline: a capture built from recorded fixtures (a
+council page that links to the portal, and one page of the portal's search
+API) is replayed through Replay, the same path `scraper.py --replay` takes.
+
+Run from the repo root: python -m unittest discover tests  (or pytest)
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import requests  # noqa: E402
+
+import scraper  # noqa: E402
+from capture import CaptureWriter, Replay, ReplayMiss, request_key  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+COUNCIL = "Glenelg Shire"
+START = "https://www.glenelg.vic.gov.au/Our-Council/Employment-opportunities/Current-vacancies"
+API = "https://jobs.dayforcehcm.com/api/geo/glenelg/jobposting/search"
+SEARCH = {"clientNamespace": "glenelg", "jobBoardCode": "CANDIDATEPORTAL", "cultureCode": "en-AU",
+          "distanceUnit": 0, "paginationStart": 0, "paginationCount": 100}
+
+def recorded(url: str, fixture: str, content_type: str) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code, resp.reason, resp.url = 200, "OK", url
+    resp.headers["Content-Type"] = content_type
+    resp._content = (FIXTURES / fixture).read_bytes()
+    return resp
+
+class DayforceReplayTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        writer = CaptureWriter(Path(tmp.name))
+        writer.record(START, COUNCIL, recorded(START, "glenelg_vacancies.html", "text/html; charset=utf-8"))
+        writer.record(request_key(API, "POST", SEARCH), COUNCIL,
+                      recorded(API, "dayforce_search.json", "application/json"))
+        writer.close()
+        self.replay = Replay(writer.path)
+
+    def adapter(self, start_url: str = START) -> scraper.DayforceAdapter:
+        adapter = scraper.pick_adapter(COUNCIL, start_url, "dayforce")
+        adapter.replay = self.replay
+        return adapter
+
+    def test_portal_link_resolves_client_and_board(self):
+        self.assertEqual(self.adapter().portal(), ("en-AU", "glenelg", "CANDIDATEPORTAL"))
+
+    def test_fetch_maps_postings_without_detail_pages(self):
+        jobs = {j.link: j for j in self.adapter().fetch()}
+        base = "https://jobs.dayforcehcm.com/en-AU/glenelg/CANDIDATEPORTAL/jobs/"
+        self.assertEqual(sorted(jobs), [base + "2211", base + "2214"])
+
+        nurse = jobs[base + "2211"]
+        self.assertEqual(nurse.title, "Maternal and Child Health Nurse")
+        self.assertEqual(nurse.council, COUNCIL)
+        self.assertEqual(nurse.source_engine, "dayforce")
+        self.assertEqual(nurse.posted_date, "2026-10-06")     # 22:30Z is the next morning in Victoria
+        self.assertEqual(nurse.closing_date, "2026-10-25")    # expires 00:00 on the 26th: open all of the 25th
+        self.assertEqual(nurse.salary, "$48.50 per hour")
+        self.assertEqual(nurse.band, "Band 6")               # sub-level 6A folds into its band
+        self.assertEqual(nurse.location, "Portland VIC 3305")
+        self.assertIn("family services", nurse.description_html)
+
+        worker = jobs[base + "2214"]
+        self.assertEqual(worker.location, "Heywood")
+        self.assertEqual(worker.closing_date, "2026-10-31")   # 23:59 local stays on its own day
+        self.assertEqual(worker.employment_type, "Temporary Full Time")
+        self.assertEqual(worker.salary, "$62,000 - $66,000 plus super")
+
+    def test_search_is_a_single_post_per_page(self):
+        # maxCount is met by the first page, so no second POST (it would miss the capture)
+        self.assertEqual(json.loads((FIXTURES / "dayforce_search.json").read_text())["maxCount"], 2)
+        self.assertEqual(len(self.adapter().fetch()), 2)
+
+    def test_unrecorded_page_misses(self):
+        with self.assertRaises(ReplayMiss):
+            self.adapter("https://www.glenelg.vic.gov.au/careers").fetch()
+
+if __name__ == "__main__":
+    unittest.main()
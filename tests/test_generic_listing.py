@@ -0,0 +1,74 @@
+"""
+GenericHTMLAdapter.fetch() offline: the landing page's listing decides which
+jobs are open, and the council's sitemap only supplies lastmod (or stands in
+when the listing shows no job links).
+
+Run from the repo root: python -m unittest discover tests  (or pytest)
+"""
+
+import datetime as dt
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import requests  # noqa: E402
+
+import scraper  # noqa: E402
+from capture import CaptureWriter, Replay  # noqa: E402
+
+COUNCIL = "Example Shire"
+HOST = "https://www.example.vic.gov.au"
+START = HOST + "/careers"
+
+def listing(*jobs: int) -> str:
+    links = "".join(f'<li><a href="/careers/jobs/{n}-officer">Officer {n}</a></li>' for n in jobs)
+    return f"<html><body><h1>Current vacancies</h1><ul>{links}</ul></body></html>"
+
+def sitemap(*jobs: int) -> str:
+    stamp = (dt.datetime.now(dt.UTC) - dt.timedelta(days=3)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    urls = "".join(f"<url><loc>{HOST}/careers/jobs/{n}-officer</loc><lastmod>{stamp}</lastmod></url>"
+                   for n in jobs)
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+def detail(n: int) -> str:
+    return f"<html><body><main><h1>Officer {n}</h1><p>Closing Date: 30/11/2026</p></main></body></html>"
+
+def response(url: str, body: str, content_type: str) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code, resp.reason, resp.url = 200, "OK", url
+    resp.headers["Content-Type"] = content_type
+    resp._content = body.encode("utf-8")
+    return resp
+
+class GenericListingTest(unittest.TestCase):
+    def replay(self, pages: dict) -> Replay:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        writer = CaptureWriter(Path(tmp.name))
+        for url, body in pages.items():
+            kind = "application/xml" if url.endswith(".xml") else "text/html; charset=utf-8"
+            writer.record(url, COUNCIL, response(url, body, kind))
+        writer.close()
+        return Replay(writer.path)
+
+    def fetch(self, pages: dict) -> list:
+        adapter = scraper.pick_adapter(COUNCIL, START, "generic")
+        adapter.replay = self.replay(pages)
+        return sorted(j.link for j in adapter.fetch())
+
+    def test_sitemap_url_no_longer_listed_is_not_emitted(self):
+        # job 3 closed: its page (and sitemap entry, with a recent lastmod) outlive the listing
+        pages = {START: listing(1, 2), HOST + "/sitemap.xml": sitemap(1, 2, 3)}
+        pages.update({f"{HOST}/careers/jobs/{n}-officer": detail(n) for n in (1, 2, 3)})
+        self.assertEqual(self.fetch(pages), [f"{HOST}/careers/jobs/1-officer", f"{HOST}/careers/jobs/2-officer"])
+
+    def test_sitemap_stands_in_for_an_empty_listing(self):
+        pages = {START: listing(), HOST + "/sitemap.xml": sitemap(4)}
+        pages[f"{HOST}/careers/jobs/4-officer"] = detail(4)
+        self.assertEqual(self.fetch(pages), [f"{HOST}/careers/jobs/4-officer"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+feeds_site_builder with --archive-dir: the head page lists only open jobs,
+whether or not an --open-jobs snapshot is in use.
+
+Run from the repo root: python -m unittest discover tests  (or pytest)
+"""
+
+import contextlib
+import datetime as dt
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import feeds_site_builder  # noqa: E402
+
+def job(n: int, closing: str, scraped: dt.datetime) -> dict:
+    return {"council": "Glenelg Shire", "title": f"Job {n}", "link": f"https://jobs.example/glenelg/{n}",
+            "posted_date": None, "closing_date": closing, "salary": None, "band": None,
+            "employment_type": None, "work_arrangement": None, "location": None,
+            "description_html": f"<p>Job {n}</p>", "scrape_date": scraped.isoformat(timespec="seconds"),
+            "source_engine": "generic"}
+
+class PagedHeadTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        now = dt.datetime.now(dt.UTC)
+        later = (now + dt.timedelta(days=30)).date().isoformat()
+        self.history = self.dir / "history.jsonl"
+        rows = [job(1, "2020-01-01", now - dt.timedelta(hours=2)),   # long closed
+                job(2, later, now - dt.timedelta(hours=1)),
+                job(3, None, now)]
+        self.history.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+
+    def build(self, *extra: str) -> str:
+        out = self.dir / "feed.xml"
+        argv = ["--in", str(self.history), "--out", str(out), "--archive-dir", str(self.dir / "archive"),
+                "--validate", *extra]
+        with contextlib.redirect_stdout(io.StringIO()):
+            feeds_site_builder.main(argv)
+        return out.read_text(encoding="utf-8")
+
+    def test_closed_job_not_on_head_with_open_jobs_snapshot(self):
+        snapshot = str(self.dir / "open_jobs.jsonl")
+        for _ in range(2):   # the first build seeds the snapshot, the second renders from it
+            feed = self.build("--open-jobs", snapshot)
+            self.assertNotIn("https://jobs.example/glenelg/1<", feed)
+            self.assertIn("https://jobs.example/glenelg/2<", feed)
+            self.assertIn("https://jobs.example/glenelg/3<", feed)
+
+    def test_closed_job_not_on_head_without_snapshot(self):
+        feed = self.build()
+        self.assertNotIn("https://jobs.example/glenelg/1<", feed)
+        self.assertIn("https://jobs.example/glenelg/2<", feed)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+registry: the compiled cache is invalidated by a validator change, and an
+unknown vendor is an error rather than a silent fallback.
+
+Run from the repo root: python -m unittest discover tests  (or pytest)
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import registry  # noqa: E402
+import scraper  # noqa: E402, F401  (registers the adapters)
+
+REGISTRY = """{"councils": [{"name": "Example Shire", "vendor": "pulse",
+  "starts": ["https://example.pulsesoftware.com/Pulse/jobs"], "tuning": {"discovery": false}}]}"""
+
+class RegistryTest(unittest.TestCase):
+    def test_cache_from_an_older_validator_is_not_reused(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "councils.json"
+            path.write_text(REGISTRY, encoding="utf-8")
+            first = registry.load_councils(str(path))
+            self.assertEqual(first[0]["tuning"]["discovery"], "off")
+            cache = Path(tmp) / ".cache" / "councils.json.json"
+            stale = json.loads(cache.read_text(encoding="utf-8"))
+            stale["format"] = registry.CACHE_FORMAT - 1
+            stale["councils"][0]["tuning"]["discovery"] = False   # what the older validator produced
+            cache.write_text(json.dumps(stale), encoding="utf-8")
+            self.assertEqual(registry.load_councils(str(path)), first)
+
+    def test_unknown_vendor_is_rejected(self):
+        with self.assertRaisesRegex(registry.RegistryError, "pulsee"):
+            registry.route("https://example.pulsesoftware.com/Pulse/jobs", "pulsee")
+
+    def test_known_vendor_and_host_routing(self):
+        self.assertIs(registry.route("https://example.vic.gov.au/jobs", "pulse"), scraper.PulseRCMAdapter)
+        self.assertIs(registry.route("https://example.pulsesoftware.com/Pulse/jobs"), scraper.PulseRCMAdapter)
+        self.assertIs(registry.route("https://example.vic.gov.au/jobs", "generic"), scraper.GenericHTMLAdapter)
+
+if __name__ == "__main__":
+    unittest.main()